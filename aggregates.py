@@ -0,0 +1,311 @@
+import threading
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+
+
+class AggregateView:
+    """
+    Running count, sum, min and max of some value columns per key. Keys are kept as integer codes
+    into each key's distinct values, in the order they were first seen, and found through a sorted
+    array of the packed codes. An update aggregates only the new rows, combines them in place into
+    the keys they touch and appends the unseen ones, inserting them into the sorted array at their
+    `searchsorted` positions; nothing already stored is re-sorted or re-aggregated. `table` is the
+    key-sorted DataFrame, built on read; `get_rows` reads the keys under one first-level key (e.g.
+    one player) only.
+    """
+
+    CODE_BITS = 21
+
+    def __init__(self, keys, value_stats):
+        self.keys = keys
+        self.value_stats = value_stats
+        self.columns = ["count"] + [f"{column}_{fn}" for column, fns in value_stats.items() for fn in fns]
+        self._levels = [pd.Index([], dtype=object) for _ in keys]
+        self._codes = [np.empty(0, dtype=np.int64) for _ in keys]
+        self._values = {column: np.empty(0, dtype=np.int64) for column in self.columns}
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._sorted_positions = np.empty(0, dtype=np.int64)
+        self._first_key_positions = {}
+        self._size = 0
+        self._table = None
+
+    def _aggregate(self, rows: pd.DataFrame):
+        grouped = rows.groupby(self.keys, observed=True, sort=False)
+        table = pd.DataFrame({"count": grouped.size()})
+        for column, fns in self.value_stats.items():
+            for fn in fns:
+                table[f"{column}_{fn}"] = grouped[column].agg(fn)
+        for column in table.columns:
+            # Counts and sums are combined across updates, so widen them past the narrow input dtypes
+            if column == "count" or column.endswith("_sum"):
+                table[column] = table[column].astype(np.int64 if pd.api.types.is_integer_dtype(table[column]) else np.float64)
+        return table
+
+    def _encode(self, index: pd.Index):
+        """Codes of each key of `index` into the stored key values, adding the values not seen yet."""
+        codes = []
+        for i in range(len(self.keys)):
+            values = index.get_level_values(i)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            if self._levels[i].empty:
+                self._levels[i] = values.unique()
+            level_codes = self._levels[i].get_indexer(values)
+            unseen = level_codes < 0
+            if unseen.any():
+                new_values = values[unseen].unique()
+                self._levels[i] = self._levels[i].append(new_values)
+                level_codes[unseen] = self._levels[i].get_indexer(values[unseen])
+            codes.append(level_codes.astype(np.int64))
+        return codes
+
+    def _append(self, codes, new: pd.DataFrame, packed):
+        size, n_new = self._size, len(new)
+        capacity = len(self._values["count"])
+        if size == 0 or size + n_new > capacity:
+            capacity = max(2 * capacity, size + n_new)
+            for column in self.columns:
+                dtype = new[column].dtype if size == 0 else self._values[column].dtype
+                self._values[column] = self._grow(self._values[column], size, capacity, dtype)
+            self._codes = [self._grow(level_codes, size, capacity, np.int64) for level_codes in self._codes]
+        for column in self.columns:
+            self._values[column][size:size + n_new] = new[column].to_numpy()
+        for level_codes, new_codes in zip(self._codes, codes):
+            level_codes[size:size + n_new] = new_codes
+
+        positions = np.arange(size, size + n_new)
+        order = np.argsort(packed)
+        insert_at = np.searchsorted(self._sorted_keys, packed[order])
+        self._sorted_keys = np.insert(self._sorted_keys, insert_at, packed[order])
+        self._sorted_positions = np.insert(self._sorted_positions, insert_at, positions[order])
+        order = np.argsort(codes[0], kind="stable")
+        first_keys, starts = np.unique(codes[0][order], return_index=True)
+        for first_key, chunk in zip(first_keys.tolist(), np.split(positions[order], starts[1:])):
+            self._first_key_positions.setdefault(first_key, []).append(chunk)
+        self._size = size + n_new
+
+    @staticmethod
+    def _grow(values, size, capacity, dtype):
+        grown = np.empty(capacity, dtype=dtype)
+        grown[:size] = values[:size]
+        return grown
+
+    def update(self, rows: pd.DataFrame):
+        new = self._aggregate(rows)
+        codes = self._encode(new.index)
+        packed = codes[0].copy()
+        for level_codes in codes[1:]:
+            packed = (packed << self.CODE_BITS) | level_codes
+
+        if self._size:
+            found = np.minimum(np.searchsorted(self._sorted_keys, packed), self._size - 1)
+            seen = self._sorted_keys[found] == packed
+        else:
+            seen = np.zeros(len(new), dtype=bool)
+
+        if seen.any():
+            touched = self._sorted_positions[found[seen]]
+            for column in self.columns:
+                values, new_values = self._values[column], new[column].to_numpy()[seen]
+                if column.endswith("_min"):
+                    values[touched] = np.minimum(values[touched], new_values)
+                elif column.endswith("_max"):
+                    values[touched] = np.maximum(values[touched], new_values)
+                else:
+                    values[touched] += new_values
+        if not seen.all():
+            self._append([level_codes[~seen] for level_codes in codes], new[~seen], packed[~seen])
+        self._table = None
+
+    def _frame(self, positions, first_level):
+        """The rows at `positions` sorted by key, like `sort_index` but on the codes instead of the key values."""
+        levels, codes = [], []
+        for level, level_codes in zip(self._levels[first_level:], self._codes[first_level:]):
+            level, order = level.sort_values(return_indexer=True)
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.arange(len(order))
+            levels.append(level)
+            codes.append(ranks[level_codes[positions]])
+        order = np.lexsort(codes[::-1])
+        positions, codes = positions[order], [level_codes[order] for level_codes in codes]
+
+        names = self.keys[first_level:]
+        if len(levels) > 1:
+            index = pd.MultiIndex(levels=levels, codes=codes, names=names, verify_integrity=False)
+        else:
+            index = levels[0].take(codes[0]).rename(names[0])
+        return pd.DataFrame({column: self._values[column][positions] for column in self.columns}, index=index)
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self._frame(np.arange(self._size), 0)
+        return self._table
+
+    def get_rows(self, first_key):
+        """The rows under `first_key`, indexed by the remaining keys."""
+        code = self._levels[0].get_indexer([first_key])[0]
+        chunks = self._first_key_positions.get(code, [])
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        return self._frame(chunks[0] if chunks else np.empty(0, dtype=np.int64), 1)
+
+
+class AggregateStore:
+    """
+    Materialized date, venue and per-player aggregates of the match table. `update` only
+    processes the rows appended since the previous call; means are derived from the stored
+    sums and counts. Reads go through the store's lock, as the views are updated in place.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drops everything seen so far. Callers hold `lock`, which is kept."""
+        self.n_rows = 0
+        self.rows_digest = None
+        self.data_version = None
+        self.point_bins = []
+        self.date = AggregateView(["date"], {"total_points_per_game": ["sum"]})
+        self.venue = AggregateView(["venue"], {"total_points_per_game": ["sum"], "margin": ["sum", "min", "max"]})
+        self.venue_point_bins = AggregateView(["point_bins", "venue"], {})
+        self.player_daily = AggregateView(["player", "date", "is_win"], {"player_team_points": ["sum"], "margin": ["sum", "min", "max"]})
+        self.player_partner = AggregateView(["player", "partner"], {"is_win": ["sum"], "player_team_points": ["sum"]})
+
+    def _extends_seen_rows(self, df: pd.DataFrame):
+        return df.shape[0] >= self.n_rows and (self.n_rows == 0 or utils.get_rows_digest(df, self.n_rows) == self.rows_digest)
+
+    def update(self, df: pd.DataFrame):
+        data_version = utils.get_data_version(df)
+        if data_version == self.data_version:
+            return self
+        if not self._extends_seen_rows(df):
+            self._reset()
+        if df.shape[0] == self.n_rows:
+            self.data_version = data_version
+            return self
+
+        new_rows = df.iloc[self.n_rows:]
+        appearances = utils.get_player_appearances(new_rows)
+        for column in ["date", "margin"]:
+            appearances[column] = new_rows[column].to_numpy()[appearances["match"].to_numpy()]
+
+        self.date.update(new_rows)
+        self.venue.update(new_rows)
+        self.venue_point_bins.update(new_rows)
+        self.player_daily.update(appearances)
+        self.player_partner.update(appearances)
+
+        self.point_bins = list(df["point_bins"].cat.categories)
+        self.n_rows = df.shape[0]
+        self.rows_digest = utils.get_rows_digest(df)
+        self.data_version = data_version
+        return self
+
+    def _table(self, view: AggregateView):
+        with self.lock:
+            return view.table
+
+    def _player_rows(self, view: AggregateView, player):
+        with self.lock:
+            return view.get_rows(player)
+
+    def get_date_df(self):
+        date = self._table(self.date)
+        date_df = pd.DataFrame({
+            "total_games": date["count"],
+            "average_ppg": date["total_points_per_game_sum"] / date["count"],
+        })
+        date_df["average_ppg"] = round(date_df["average_ppg"], 2)
+        return date_df
+
+    def get_venue_games_df(self):
+        return pd.DataFrame({"total_games": self._table(self.venue)["count"]}).reset_index()
+
+    def get_venue_stats_df(self):
+        venue = self._table(self.venue)
+        return pd.DataFrame({
+            "total_games": venue["count"],
+            "average_ppg": venue["total_points_per_game_sum"] / venue["count"],
+            "mean_margin": venue["margin_sum"] / venue["count"],
+            "max_margin": venue["margin_max"],
+            "min_margin": venue["margin_min"],
+        })
+
+    def get_venue_point_bins_df(self):
+        index = pd.MultiIndex.from_product([self.point_bins, self._table(self.venue).index], names=["point_bins", "venue"])
+        venue_point_bins_df = pd.DataFrame({"total_games": self._table(self.venue_point_bins)["count"].reindex(index, fill_value=0)}).reset_index()
+        venue_point_bins_df["point_bins"] = pd.Categorical(venue_point_bins_df["point_bins"], categories=self.point_bins, ordered=True)
+        return venue_point_bins_df
+
+    def get_player_win_loss_df(self, player):
+        daily = self._player_rows(self.player_daily, player)
+        by_result = daily.groupby(level="is_win")
+        win_loss = pd.DataFrame({
+            "count": by_result["count"].sum(),
+            "player_team_points_sum": by_result["player_team_points_sum"].sum(),
+            "margin_sum": by_result["margin_sum"].sum(),
+            "margin_max": by_result["margin_max"].max(),
+            "margin_min": by_result["margin_min"].min(),
+        })
+        win_loss.index = pd.Index(np.where(win_loss.index == 1, "win", "loss"), name="result")
+        return pd.DataFrame({
+            "total_games": win_loss["count"],
+            "average_ppg": win_loss["player_team_points_sum"] / win_loss["count"],
+            "mean_margin": win_loss["margin_sum"] / win_loss["count"],
+            "max_margin": win_loss["margin_max"],
+            "min_margin": win_loss["margin_min"],
+        })
+
+    def get_player_daily_df(self, player):
+        daily = self._player_rows(self.player_daily, player)
+        daily.index = daily.index.set_levels(
+            [pd.Index(np.where(daily.index.levels[1] == 1, "win", "loss"))], level=["is_win"]
+        ).rename("result", level="is_win")
+        return pd.DataFrame({
+            "total_games": daily["count"],
+            "average_ppg": daily["player_team_points_sum"] / daily["count"],
+            "mean_margin": daily["margin_sum"] / daily["count"],
+            "max_margin": daily["margin_max"],
+            "min_margin": daily["margin_min"],
+        })
+
+    def get_player_daily_summary_df(self, player):
+        daily = self._player_rows(self.player_daily, player)
+        wins = daily["count"].where(daily.index.get_level_values("is_win") == 1, 0)
+        by_date = daily[["count", "player_team_points_sum"]].assign(wins=wins).groupby(level="date").sum()
+
+        daily_summary = pd.DataFrame({
+            "total_games": by_date["count"],
+            "wins": by_date["wins"],
+            "average_ppg": by_date["player_team_points_sum"] / by_date["count"],
+        }).reset_index()
+        daily_summary["win_pct"] = round(daily_summary["wins"] * 100 / daily_summary["total_games"], 2)
+        daily_summary["average_ppg"] = round(daily_summary["average_ppg"], 2)
+        return daily_summary
+
+    def get_player_partner_df(self, player):
+        partners = self._player_rows(self.player_partner, player)
+
+        player_partner_stats = pd.DataFrame({
+            "total_games": partners["count"],
+            "wins": partners["is_win_sum"],
+            "average_ppg": partners["player_team_points_sum"] / partners["count"],
+        })
+        player_partner_stats["win_pct"] = round(player_partner_stats['wins'] * 100 / player_partner_stats['total_games'], 2)
+        player_partner_stats["average_ppg"] = round(player_partner_stats["average_ppg"], 2)
+        return player_partner_stats
+
+
+_stores = utils.WindowedInstances(AggregateStore)
+
+
+@profiling.profiled()
+def get_aggregate_store(df: pd.DataFrame) -> AggregateStore:
+    store = _stores.get(df)
+    with store.lock:
+        return store.update(df)
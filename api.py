@@ -0,0 +1,200 @@
+"""
+Read-only JSON API over the same stats as the dashboard.
+
+    DATA_SOURCE=parquet DATA_SOURCE_PATH=data python api.py --port 8000
+
+    GET /api/summary
+    GET /api/leaderboard
+    GET /api/partnerships
+    GET /api/dates
+    GET /api/venues
+    GET /api/players
+    GET /api/players/<player>
+    GET /api/players/<player>/matches
+
+Response bodies are serialized once per data version and carry an ETag, so unchanged data is
+answered with a 304. League and player summaries are built when the data is loaded, a player's
+matches on their first request. The data is reloaded in the background every `--refresh` seconds;
+request handlers only read the finished snapshot.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import tornado.ioloop
+import tornado.web
+import pandas as pd
+import utils
+import data_cache
+import player_index
+import ratings
+import streaks
+from sections import leaderboard, partnerships, datewise_stats, venue_section, individual_stats
+
+
+def get_summary_data(df: pd.DataFrame):
+    return {
+        "data_version": utils.get_data_version(df),
+        "total_games": df.shape[0],
+        "total_players": len(player_index.get_player_index(df).players),
+        "first_date": f"{df['date'].iloc[0]:{utils.DISPLAY_DATE_FORMAT}}",
+        "last_date": f"{df['date'].iloc[-1]:{utils.DISPLAY_DATE_FORMAT}}",
+    }
+
+
+def to_json(data):
+    """
+    `data` as a JSON string, frames as lists of records with ISO dates. Each frame is serialized by
+    pandas exactly once, and dicts are joined from the serialized parts instead of round-tripped.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.to_json(orient="records", date_format="iso")
+    if isinstance(data, pd.Series):
+        return data.to_json(date_format="iso")
+    if isinstance(data, dict):
+        return "{" + ", ".join(f"{json.dumps(key)}: {to_json(value)}" for key, value in data.items()) + "}"
+    return json.dumps(data, default=str)
+
+
+def get_player_data(df: pd.DataFrame, player, streak_summary: pd.DataFrame):
+    rating_history = individual_stats.get_player_rating_history_df(df, player)
+    return {
+        "player": player,
+        "rating": rating_history["rating"].iloc[-1],
+        "peak_rating": rating_history["rating"].max(),
+        "streaks": streak_summary.loc[player],
+        "win_loss": individual_stats.get_player_win_loss_df(df, player).reset_index(),
+        "partners": individual_stats.get_player_partner_df(df, player).reset_index(),
+        "opponents": individual_stats.get_player_opponent_df(df, player).reset_index(),
+        "daily": individual_stats.get_player_daily_summary_df(df, player),
+    }
+
+
+def get_player_matches_data(index: player_index.PlayerIndex, player):
+    """The rows `utils.get_player_stats` returns for the player."""
+    return index.get_player_matches(player).drop(columns=["partner", "opponent_1", "opponent_2"])
+
+
+LEAGUE_RESOURCES = {
+    "summary": get_summary_data,
+    "leaderboard": leaderboard.get_leaderboard_df,
+    "partnerships": partnerships.get_best_partnerships_df,
+    "dates": lambda df: datewise_stats.get_date_df(df).reset_index(),
+    "venues": lambda df: venue_section.get_venue_stats_df(df).reset_index(),
+    "players": lambda df: player_index.get_player_index(df).players,
+}
+
+
+class Resource:
+    """A response body serialized once, with its ETag."""
+
+    def __init__(self, data):
+        self.body = to_json(data).encode()
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+
+
+class StatsSnapshot:
+    """
+    Serialized resources of one data version. League and player summaries read the shared stores,
+    so they are all built up front; the much larger match lists only need the snapshot's own player
+    index, which never changes, and are built on the first request for each player.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.data_version = utils.get_data_version(df)
+        self.index = player_index.get_player_index(df)
+        self.lock = threading.Lock()
+        self.matches = {}
+        ratings.get_rating_engine(df)
+        streak_summary = streaks.get_streaks(df).get_summary()
+        self.resources = {name: Resource(build(df)) for name, build in LEAGUE_RESOURCES.items()}
+        self.player_resources = {
+            player: Resource(get_player_data(df, player, streak_summary)) for player in self.index.players
+        }
+
+    def get_player_resource(self, player, matches=False):
+        if not matches:
+            return self.player_resources.get(player)
+        if player not in self.index.offsets:
+            return None
+        with self.lock:
+            if player not in self.matches:
+                self.matches[player] = Resource(get_player_matches_data(self.index, player))
+            return self.matches[player]
+
+
+class StatsService:
+
+    def __init__(self, data_source):
+        self.data_source = data_source
+        self.snapshot = None
+
+    def load(self):
+        """Reloads the data, swapping in a fully built snapshot only if the data version changed."""
+        df = utils.prepare_match_table(utils.load_records(self.data_source))
+        if self.snapshot is None or utils.get_data_version(df) != self.snapshot.data_version:
+            self.snapshot = StatsSnapshot(df)
+
+    async def refresh(self):
+        await tornado.ioloop.IOLoop.current().run_in_executor(None, self.load)
+
+
+class StatsHandler(tornado.web.RequestHandler):
+
+    def initialize(self, service):
+        self.service = service
+        self.etag = None
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Cache-Control", "no-cache")
+
+    def compute_etag(self):
+        return self.etag
+
+    def respond(self, resource):
+        if resource is None:
+            raise tornado.web.HTTPError(404)
+        self.etag = resource.etag
+        self.write(resource.body)
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({"error": self._reason})
+
+
+class LeagueHandler(StatsHandler):
+
+    def get(self, name):
+        self.respond(self.service.snapshot.resources.get(name))
+
+
+class PlayerHandler(StatsHandler):
+
+    def get(self, player, matches):
+        self.respond(self.service.snapshot.get_player_resource(player, matches=bool(matches)))
+
+
+def make_app(service):
+    return tornado.web.Application([
+        (r"/api/(summary|leaderboard|partnerships|dates|venues|players)", LeagueHandler, dict(service=service)),
+        (r"/api/players/([^/]+)(/matches)?", PlayerHandler, dict(service=service)),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--refresh", type=int, default=data_cache.CACHE_TTL, help="seconds between data reloads")
+    args = parser.parse_args()
+
+    service = StatsService(utils.get_data_source())
+    service.load()
+    make_app(service).listen(args.port)
+    tornado.ioloop.PeriodicCallback(service.refresh, args.refresh * 1000).start()
+    print(f"Serving {service.snapshot.df.shape[0]} games on port {args.port}")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ import json
 import plotly.express as px
 import plotly.graph_objects as go
 import utils
-from sections import venue_section, leaderboard, datewise_stats
+import profiling
+from sections import venue_section, leaderboard, datewise_stats, partnerships
 import media.icon_constants as icons
 
 st.set_page_config(layout="wide")
@@ -15,22 +16,28 @@ st.set_page_config(layout="wide")
 sidebar = st.sidebar
 
 sidebar.title("Badminton Tracking")
+if sidebar.button("Refresh data"):
+    utils.refresh_data()
+with profiling.profile_run(sidebar, sidebar.checkbox("Profile this page", value=profiling.DEFAULT_ENABLED), name="app"):
+    df = utils.select_time_window(sidebar, utils.get_data())
+    if df.empty:
+        st.info("No games were played in this time window.")
+        st.stop()
 
-df = utils.get_data()
+    st.markdown(f"<h1>Badminton Tracking{icons.MAIN_LOGO}</h1>", unsafe_allow_html=True)
 
-st.markdown(f"<h1>Badminton Tracking{icons.MAIN_LOGO}</h1>", unsafe_allow_html=True)
+    st.markdown(f"<h3>Total Games Played: {df.shape[0]}</h3>", unsafe_allow_html=True)
 
-st.markdown(f"<h3>Total Games Played: {df.shape[0]}</h3>", unsafe_allow_html=True)
+    st.markdown(f"<hr><h5>{icons.LEADERBOARD}&nbsp;Leaderboard</h5>", unsafe_allow_html=True)
+    leaderboard.display_leaderboard(df)
 
-all_players = list(np.unique(df[["team_1_player_1", "team_1_player_2", "team_2_player_1", "team_2_player_2"]].values))
+    st.markdown(f"<hr><h5>{icons.LEADERBOARD}&nbsp;Best Partnerships</h5>", unsafe_allow_html=True)
+    partnerships.display_best_partnerships(df)
 
-st.markdown(f"<hr><h5>{icons.LEADERBOARD}&nbsp;Leaderboard</h5>", unsafe_allow_html=True)
-leaderboard.display_leaderboard(df, all_players)
+    st.markdown(f"<hr><h5>{icons.CALENDAR}&nbsp;Date Wise stats</h5>", unsafe_allow_html=True)
+    datewise_stats.display_date_section(df)
 
-st.markdown(f"<hr><h5>{icons.CALENDAR}&nbsp;Date Wise stats</h5>", unsafe_allow_html=True)
-datewise_stats.display_date_section(df)
+    st.markdown(f"<hr><h5>{icons.STADIUM}&nbsp;Venue Wise stats</h5>", unsafe_allow_html=True)
+    venue_section.display_venue_stats(df)
 
-st.markdown(f"<hr><h5>{icons.STADIUM}&nbsp;Venue Wise stats</h5>", unsafe_allow_html=True)
-venue_section.display_venue_stats(df)
-
-st.markdown("<hr>", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown("<hr>", unsafe_allow_html=True)
@@ -0,0 +1,276 @@
+"""
+Times every section on synthetic match tables, splitting data computation from figure construction.
+
+    python -m benchmarks.bench_sections --matches 1000 100000 --players 10 1000
+    python -m benchmarks.bench_sections --compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Streamlit is stubbed out, so `render` times the full `display_*` call minus the browser round trip.
+`figure` rows also record `payload_bytes`, the size of the figure JSON sent to the browser; the
+`*.page` entries build the first page of the paginated tables for comparison with the full tables.
+The player index, aggregate store, rating engine, matchup matrices and streaks are timed on their own (the store
+also for appending 1% new rows); the sections then run against them warm, as they do on a rerun.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import utils
+import player_index
+import aggregates
+import ratings
+import matchups
+import streaks
+from benchmarks import synthetic
+from sections import leaderboard, partnerships, datewise_stats, venue_section, individual_stats
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class StreamlitStub:
+    """Accepts any `st.*` call, attribute access or indexing and does nothing; widgets return their defaults."""
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        options = list(options)
+        return options[index] if options else None
+
+    radio = selectbox
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return value if value is not None else (min_value if min_value is not None else 0)
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def button(self, label, **kwargs):
+        return False
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getitem__(self, key):
+        return self
+
+
+def _section_benchmarks(df, player):
+    return {
+        "leaderboard": (
+            lambda: leaderboard.get_leaderboard_df(df),
+            leaderboard.create_leaderboard_figure,
+            lambda: leaderboard.display_leaderboard(df),
+        ),
+        "leaderboard.page": (
+            lambda: utils.get_table_page(leaderboard.get_leaderboard_df(df))[0],
+            leaderboard.create_leaderboard_figure,
+            None,
+        ),
+        "partnerships": (
+            lambda: partnerships.get_best_partnerships_df(df),
+            partnerships.create_best_partnerships_figure,
+            lambda: partnerships.display_best_partnerships(df),
+        ),
+        "datewise_stats": (
+            lambda: datewise_stats.get_date_df(df),
+            datewise_stats.create_date_table_figure,
+            lambda: datewise_stats.display_date_section(df),
+        ),
+        "datewise_stats.page": (
+            lambda: utils.get_table_page(datewise_stats.get_date_df(df))[0],
+            datewise_stats.create_date_table_figure,
+            None,
+        ),
+        "venue_section": (
+            lambda: (venue_section.get_venue_point_bins_df(df), venue_section.get_venue_games_df(df), venue_section.get_venue_stats_df(df)),
+            lambda result: (venue_section.create_venue_bar_chart(result[0]), venue_section.create_venue_pie_chart(result[1])),
+            lambda: venue_section.display_venue_stats(df),
+        ),
+        "individual_stats.win_loss": (
+            lambda: individual_stats.get_player_win_loss_df(df, player),
+            lambda result: (individual_stats.create_win_loss_pie(result), individual_stats.create_player_performance_figure(result)),
+            lambda: individual_stats.display_player_win_loss_stats(df, player),
+        ),
+        "individual_stats.partner": (
+            lambda: individual_stats.get_player_partner_df(df, player),
+            lambda result: (individual_stats.create_partner_table_figure(result), individual_stats.create_partner_bar_chart(result)),
+            lambda: individual_stats.display_player_partner_stats(df, player),
+        ),
+        "individual_stats.daily": (
+            lambda: (individual_stats.get_player_daily_df(df, player), individual_stats.get_player_daily_summary_df(df, player)),
+            lambda result: (individual_stats.create_daily_bar_chart(result[0], player), individual_stats.create_daily_table_figure(result[1])),
+            lambda: individual_stats.display_player_daily_stats(df, player),
+        ),
+        "individual_stats.head_to_head": (
+            lambda: individual_stats.get_player_opponent_df(df, player),
+            individual_stats.create_opponent_table_figure,
+            lambda: individual_stats.display_player_head_to_head_stats(df, player),
+        ),
+        "individual_stats.rating": (
+            lambda: individual_stats.get_player_rating_history_df(df, player),
+            lambda result: individual_stats.create_rating_history_chart(result, player),
+            lambda: individual_stats.display_player_rating_stats(df, player),
+        ),
+        "individual_stats.streaks": (
+            lambda: (individual_stats.get_player_streak_summary(df, player), individual_stats.get_player_rolling_form_df(df, player)),
+            lambda result: individual_stats.create_rolling_form_chart(result[1], player, 10),
+            lambda: individual_stats.display_player_streak_stats(df, player),
+        ),
+    }
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def _payload_bytes(figures):
+    figures = figures if isinstance(figures, tuple) else (figures,)
+    return sum(len(figure.to_json()) for figure in figures)
+
+
+def _result_row(section, stage, n_matches, n_players, timings, **extra):
+    return {
+        "section": section,
+        "stage": stage,
+        "matches": n_matches,
+        "players": n_players,
+        "min_seconds": min(timings),
+        "median_seconds": float(np.median(timings)),
+        **extra,
+    }
+
+
+def run_benchmarks(match_counts, player_counts, repeat=3, seed=0):
+    sections = [leaderboard, partnerships, datewise_stats, venue_section, individual_stats]
+    original_st = [section.st for section in sections]
+    for section in sections:
+        section.st = StreamlitStub()
+
+    results = []
+    try:
+        for n_matches in match_counts:
+            for n_players in player_counts:
+                df = synthetic.generate_match_table(n_matches, n_players, seed=seed)
+
+                def build_index():
+                    player_index.get_player_index.clear()
+                    return player_index.get_player_index(df)
+
+                index, timings = _time(build_index, repeat)
+                results.append(_result_row("player_index", "compute", n_matches, n_players, timings))
+
+                player = max(index.offsets, key=lambda name: index.offsets[name][1] - index.offsets[name][0])
+                _, timings = _time(lambda: index.get_player_matches(player), repeat)
+                results.append(_result_row("player_index.get_player_matches", "compute", n_matches, n_players, timings))
+
+                _, timings = _time(lambda: aggregates.AggregateStore().update(df), repeat)
+                results.append(_result_row("aggregate_store", "compute", n_matches, n_players, timings))
+
+                seen_rows = df.iloc[:n_matches - max(1, n_matches // 100)]
+                timings = []
+                for _ in range(repeat):
+                    store = aggregates.AggregateStore().update(seen_rows)
+                    timings.append(_time(lambda: store.update(df), 1)[1][0])
+                results.append(_result_row("aggregate_store.append_1pct", "compute", n_matches, n_players, timings))
+
+                _, timings = _time(lambda: ratings.RatingEngine().update(df), repeat)
+                results.append(_result_row("rating_engine", "compute", n_matches, n_players, timings))
+
+                def build_matchups():
+                    matchups.get_matchups.clear()
+                    return matchups.get_matchups(df)
+
+                _, timings = _time(build_matchups, repeat)
+                results.append(_result_row("matchups", "compute", n_matches, n_players, timings))
+
+                def build_streaks():
+                    streaks.get_streaks.clear()
+                    return streaks.get_streaks(df)
+
+                _, timings = _time(build_streaks, repeat)
+                results.append(_result_row("streaks", "compute", n_matches, n_players, timings))
+
+                last_date = df["date"].iloc[-1]
+                _, timings = _time(lambda: utils.get_date_window(df, start=last_date - pd.Timedelta(days=29), key="last_30"), repeat)
+                results.append(_result_row("date_window", "compute", n_matches, n_players, timings))
+
+                aggregates.get_aggregate_store(df)
+                for name, (compute, build_figures, render) in _section_benchmarks(df, player).items():
+                    result, timings = _time(compute, repeat)
+                    results.append(_result_row(name, "compute", n_matches, n_players, timings))
+                    figures, timings = _time(lambda: build_figures(result), repeat)
+                    results.append(_result_row(name, "figure", n_matches, n_players, timings, payload_bytes=_payload_bytes(figures)))
+                    if render is not None:
+                        _, timings = _time(render, repeat)
+                        results.append(_result_row(name, "render", n_matches, n_players, timings))
+
+                print(f"{n_matches} matches x {n_players} players done")
+    finally:
+        for section, st in zip(sections, original_st):
+            section.st = st
+
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare_results(old_path, new_path):
+    with open(old_path) as f:
+        old = pd.DataFrame(json.load(f)["results"])
+    with open(new_path) as f:
+        new = pd.DataFrame(json.load(f)["results"])
+
+    keys = ["section", "stage", "matches", "players"]
+    comparison = old.merge(new, on=keys, suffixes=("_old", "_new"))
+    comparison["ratio"] = round(comparison["median_seconds_new"] / comparison["median_seconds_old"], 2)
+    return comparison[keys + ["median_seconds_old", "median_seconds_new", "ratio"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="defaults to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(compare_results(*args.compare))
+        return
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "results": run_benchmarks(args.matches, args.players, repeat=args.repeat, seed=args.seed),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
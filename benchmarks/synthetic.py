@@ -0,0 +1,89 @@
+"""
+Synthetic form responses with the same columns as the Google Sheet, for benchmarks and offline runs.
+
+    python -m benchmarks.synthetic --matches 100000 --players 200 --source parquet --path data
+"""
+import argparse
+import numpy as np
+import pandas as pd
+import utils
+from fetch_sheets_data import DATA_SOURCES
+
+RECORD_COLUMNS = [
+    "Timestamp", "Date", "Team 1 Player 1", "Team 1 Player 2", "Team 2 Player 1", "Team 2 Player 2",
+    "Team 1 Points", "Team 2 Points", "Venue", "result"
+]
+MAX_DAYS = 3650
+
+
+def _draw_players(rng, n_matches, weights):
+    players = rng.choice(len(weights), size=(n_matches, 4), p=weights)
+    while True:
+        ordered = np.sort(players, axis=1)
+        clashes = (np.diff(ordered, axis=1) == 0).any(axis=1)
+        if not clashes.any():
+            return players
+        players[clashes] = rng.choice(len(weights), size=(clashes.sum(), 4), p=weights)
+
+
+def generate_records(n_matches, n_players, n_venues=5, games_per_day=12, seed=0):
+    """
+    Matches between `n_players` players of varying skill and activity, played about `games_per_day`
+    at a time on consecutive days (more per day once the history would exceed ten years).
+    Games go to 21, with occasional deuces up to 30.
+    """
+    if n_players < 4:
+        raise ValueError(f"a doubles match needs 4 distinct players, got n_players={n_players}")
+    rng = np.random.default_rng(seed)
+
+    activity = 1 / np.arange(1, n_players + 1) ** 0.8
+    players = _draw_players(rng, n_matches, activity / activity.sum())
+    skill = rng.normal(0, 1, n_players)
+    team_skill_gap = skill[players[:, :2]].sum(axis=1) - skill[players[:, 2:]].sum(axis=1)
+    team_1_wins = rng.random(n_matches) < 1 / (1 + np.exp(-team_skill_gap))
+
+    deuce = rng.random(n_matches) < 0.15
+    winner_points = np.where(deuce, rng.integers(22, 31, n_matches), 21)
+    loser_points = np.where(deuce, winner_points - 2, np.clip(rng.normal(15, 3.5, n_matches).round(), 0, 19)).astype(int)
+
+    n_days = max(1, min(n_matches // games_per_day, MAX_DAYS))
+    days = np.arange(n_matches) * n_days // max(n_matches, 1)
+    slots = np.arange(n_matches) - np.searchsorted(days, days)
+    day_strings = pd.date_range("2015-01-01", periods=n_days).strftime("%m/%d/%Y").to_numpy()
+    clock = np.array([f"{6 + slot // 360:02d}:{slot // 6 % 60:02d}:{slot % 6 * 10:02d}" for slot in range(slots.max(initial=0) + 1)], dtype=object)
+
+    player_names = np.array([f"Player {i}" for i in range(n_players)], dtype=object)
+    venue_names = np.array([f"Court {i}" for i in range(n_venues)], dtype=object)
+
+    return pd.DataFrame({
+        "Timestamp": day_strings[days].astype(object) + " " + clock[slots],
+        "Date": day_strings[days],
+        **{column: player_names[players[:, i]] for i, column in enumerate(RECORD_COLUMNS[2:6])},
+        "Team 1 Points": np.where(team_1_wins, winner_points, loser_points),
+        "Team 2 Points": np.where(team_1_wins, loser_points, winner_points),
+        "Venue": venue_names[rng.integers(0, n_venues, n_matches)],
+        "result": "",
+    })
+
+
+def generate_match_table(n_matches, n_players, **kwargs):
+    """Synthetic match table with the schema `utils.get_data` returns."""
+    return utils.prepare_match_table(generate_records(n_matches, n_players, **kwargs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--venues", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--source", choices=DATA_SOURCES.keys(), default="parquet")
+    parser.add_argument("--path", required=True)
+    args = parser.parse_args()
+
+    records = generate_records(args.matches, args.players, n_venues=args.venues, seed=args.seed)
+    DATA_SOURCES[args.source](args.path).write_sheet_data(utils.WORKBOOK_NAME, utils.WORKSHEET_NAME, records)
+
+
+if __name__ == "__main__":
+    main()
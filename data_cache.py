@@ -0,0 +1,76 @@
+import os
+import time
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get("DATA_CACHE_DIR", ".data_cache")
+CACHE_TTL = int(os.environ.get("DATA_CACHE_TTL", 300))
+FULL_SYNC_INTERVAL = int(os.environ.get("DATA_CACHE_FULL_SYNC_INTERVAL", 3600))
+
+
+def snapshot_path(workbook_name, worksheet_name):
+    file_name = f"{workbook_name}__{worksheet_name}".replace(" ", "_").replace(os.sep, "_")
+    return os.path.join(SNAPSHOT_DIR, f"{file_name}.parquet")
+
+
+def read_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def _full_sync_marker(path):
+    return f"{path}.full_sync"
+
+
+def needs_full_sync(path):
+    """True when the snapshot was last fetched in full more than FULL_SYNC_INTERVAL seconds ago."""
+    marker = _full_sync_marker(path)
+    return not os.path.exists(marker) or time.time() - os.path.getmtime(marker) > FULL_SYNC_INTERVAL
+
+
+def clear_snapshots():
+    """Deletes every snapshot, so the next sync of each worksheet fetches it in full."""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    for file_name in os.listdir(SNAPSHOT_DIR):
+        os.remove(os.path.join(SNAPSHOT_DIR, file_name))
+
+
+def write_snapshot(records: pd.DataFrame, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    records.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _full_sync(gsheet, workbook_name, worksheet_name, path):
+    records = gsheet.get_sheet_data(workbook_name, worksheet_name)
+    write_snapshot(records, path)
+    with open(_full_sync_marker(path), "w"):
+        pass
+    return records
+
+
+def sync_snapshot(gsheet, workbook_name, worksheet_name):
+    """
+    Returns the raw records of a worksheet, fetching only the rows appended since the last sync.
+
+    The last cached row is fetched again along with the new rows; if its Timestamp no longer
+    matches (rows were deleted or re-sorted in the sheet) the snapshot is rebuilt. Edits to earlier
+    rows can't be seen that way, so the worksheet is also fetched in full every FULL_SYNC_INTERVAL
+    seconds, and whenever the snapshots are cleared (the dashboard's "Refresh data").
+    """
+    path = snapshot_path(workbook_name, worksheet_name)
+    snapshot = read_snapshot(path)
+    if snapshot is None or snapshot.empty or needs_full_sync(path):
+        return _full_sync(gsheet, workbook_name, worksheet_name, path)
+
+    new_rows = gsheet.get_sheet_rows(workbook_name, worksheet_name, start_row=len(snapshot) + 1)
+    if new_rows.empty or new_rows["Timestamp"].iloc[0] != snapshot["Timestamp"].iloc[-1]:
+        return _full_sync(gsheet, workbook_name, worksheet_name, path)
+    if len(new_rows) == 1:
+        return snapshot
+
+    records = pd.concat([snapshot, new_rows.iloc[1:]], ignore_index=True)
+    write_snapshot(records, path)
+    return records
@@ -0,0 +1,113 @@
+"""
+In-process stand-in for the parts of the gspread client `fetch_sheets_data.Gsheet` uses,
+so the dashboard can run without the Google API:
+
+    gsheet = Gsheet(client=FakeClient.from_records({"Badminton_Records": {"Form responses 1": records}}))
+
+`latency` adds a sleep to every worksheet API call, to stand in for the network round trip.
+"""
+import time
+import pandas as pd
+from gspread.exceptions import SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import numericise_all
+
+
+class FakeWorksheet:
+
+    def __init__(self, title, values=None, latency=0):
+        self.title = title
+        self._values = [list(row) for row in values or []]
+        self.latency = latency
+        self.api_calls = 0
+
+    @classmethod
+    def from_dataframe(cls, title, records: pd.DataFrame, latency=0):
+        values = [list(records.columns)] + records.astype(object).where(records.notna(), "").values.tolist()
+        return cls(title, [[f"{value}" for value in row] for row in values], latency)
+
+    def _api_call(self):
+        self.api_calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def row_count(self):
+        return len(self._values)
+
+    def _padded(self, rows):
+        width = max((len(row) for row in self._values), default=0)
+        return [row + [""] * (width - len(row)) for row in rows]
+
+    def _row_range(self, range_name):
+        start, stop = range_name.split(":")
+        return self._padded(self._values[int(start) - 1:int(stop)])
+
+    def get_all_values(self, **kwargs):
+        self._api_call()
+        return self._padded(self._values)
+
+    def get_all_records(self, head=1, default_blank="", **kwargs):
+        data = self.get_all_values()
+        if len(data) < head:
+            return []
+        keys = data[head - 1]
+        return [dict(zip(keys, numericise_all(row, default_blank=default_blank))) for row in data[head:]]
+
+    def row_values(self, row, **kwargs):
+        self._api_call()
+        return list(self._values[row - 1]) if row <= len(self._values) else []
+
+    def batch_get(self, ranges, **kwargs):
+        self._api_call()
+        return [self._row_range(range_name) for range_name in ranges]
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values, **kwargs):
+        self._api_call()
+        self._values.extend([f"{value}" for value in row] for row in values)
+
+
+class FakeWorkbook:
+
+    def __init__(self, title, worksheets=None):
+        self.title = title
+        self._worksheets = {worksheet.title: worksheet for worksheet in worksheets or []}
+
+    def worksheet(self, title):
+        if title not in self._worksheets:
+            raise WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title, rows=0, cols=0, **kwargs):
+        self._worksheets[title] = FakeWorksheet(title)
+        return self._worksheets[title]
+
+
+class FakeClient:
+
+    def __init__(self, workbooks=None):
+        self._workbooks = {workbook.title: workbook for workbook in workbooks or []}
+
+    @classmethod
+    def from_records(cls, workbooks, latency=0):
+        """`workbooks` maps workbook name -> worksheet name -> DataFrame of records."""
+        return cls([
+            FakeWorkbook(workbook_name, [
+                FakeWorksheet.from_dataframe(worksheet_name, records, latency) for worksheet_name, records in worksheets.items()
+            ])
+            for workbook_name, worksheets in workbooks.items()
+        ])
+
+    def open(self, title, **kwargs):
+        if title not in self._workbooks:
+            raise SpreadsheetNotFound(title)
+        return self._workbooks[title]
+
+    def create(self, title, **kwargs):
+        self._workbooks[title] = FakeWorkbook(title)
+        return self._workbooks[title]
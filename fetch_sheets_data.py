@@ -1,13 +1,159 @@
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+from contextlib import closing
 import gspread
 import pandas as pd
 import numpy as np
+import profiling
+from gspread.exceptions import APIError
+from gspread.utils import numericise_all
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
-class Gsheet:
+RETRY_STATUS_CODES = {429, 500, 502, 503}
 
-    def __init__(self, config_dict):
-        self.service_account = gspread.service_account_from_dict(config_dict)
+
+def _is_retryable(error):
+    return isinstance(error, APIError) and getattr(error.response, "status_code", None) in RETRY_STATUS_CODES
+
+
+# Sheets API quota errors (429) and transient server errors, retried with jittered exponential backoff.
+retry_on_rate_limit = retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_random_exponential(multiplier=1, max=32),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+
+
+class DataSource(ABC):
+    """
+    Where the raw form responses come from. A workbook holds worksheets, each one a table
+    whose first row is the header, mirroring the layout of the Google Sheet.
+    """
+    is_remote = False
+
+    @abstractmethod
+    def get_sheet_data(self, workbook_name, worksheet_name):
+        pass
+
+    def get_sheet_rows(self, workbook_name, worksheet_name, start_row=2):
+        """Fetch the rows from `start_row` (1-indexed, header is row 1) to the end of the sheet."""
+        return self.get_sheet_data(workbook_name, worksheet_name).iloc[start_row - 2:].reset_index(drop=True)
+
+
+class Gsheet(DataSource):
+    is_remote = True
+
+    def __init__(self, config_dict=None, client=None):
+        self.service_account = client if client is not None else gspread.service_account_from_dict(config_dict)
+        self.workbooks = {}
+        self.lock = threading.Lock()
+
+    def _worksheet(self, workbook_name, worksheet_name):
+        """Opens the worksheet, reusing the workbook handle (opening a workbook by name is a Drive API search)."""
+        with self.lock:
+            workbook = self.workbooks.get(workbook_name)
+        if workbook is None:
+            workbook = self.service_account.open(workbook_name)
+            with self.lock:
+                self.workbooks[workbook_name] = workbook
+        return workbook.worksheet(worksheet_name)
+
+    @profiling.profiled()
+    @retry_on_rate_limit
+    def get_sheet_data(self, workbook_name, worksheet_name):
+        worksheet = self._worksheet(workbook_name, worksheet_name)
+        return pd.DataFrame(worksheet.get_all_records())
+
+    @profiling.profiled()
+    @retry_on_rate_limit
+    def get_sheet_rows(self, workbook_name, worksheet_name, start_row=2):
+        worksheet = self._worksheet(workbook_name, worksheet_name)
+        if start_row > worksheet.row_count:
+            return pd.DataFrame(columns=worksheet.row_values(1))
+
+        header, rows = worksheet.batch_get(["1:1", f"{start_row}:{worksheet.row_count}"])
+        header = header[0] if header else []
+        return pd.DataFrame(
+            [numericise_all(row + [""] * (len(header) - len(row))) for row in rows],
+            columns=header
+        )
+
+
+class CsvSource(DataSource):
+    """Reads `<path>/<workbook_name>/<worksheet_name>.csv`."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file_path(self, workbook_name, worksheet_name):
+        return os.path.join(self.path, workbook_name, f"{worksheet_name}.csv")
 
     def get_sheet_data(self, workbook_name, worksheet_name):
-        workbook = self.service_account.open(workbook_name)
-        worksheet = workbook.worksheet(worksheet_name)
-        return pd.DataFrame(worksheet.get_all_records())
\ No newline at end of file
+        return pd.read_csv(self._file_path(workbook_name, worksheet_name), keep_default_na=False)
+
+    def get_sheet_rows(self, workbook_name, worksheet_name, start_row=2):
+        return pd.read_csv(
+            self._file_path(workbook_name, worksheet_name),
+            skiprows=range(1, start_row - 1),
+            keep_default_na=False
+        )
+
+    def write_sheet_data(self, workbook_name, worksheet_name, records: pd.DataFrame):
+        file_path = self._file_path(workbook_name, worksheet_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        records.to_csv(file_path, index=False)
+
+
+class ParquetSource(DataSource):
+    """Reads `<path>/<workbook_name>/<worksheet_name>.parquet`."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file_path(self, workbook_name, worksheet_name):
+        return os.path.join(self.path, workbook_name, f"{worksheet_name}.parquet")
+
+    def get_sheet_data(self, workbook_name, worksheet_name):
+        return pd.read_parquet(self._file_path(workbook_name, worksheet_name))
+
+    def write_sheet_data(self, workbook_name, worksheet_name, records: pd.DataFrame):
+        file_path = self._file_path(workbook_name, worksheet_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        records.to_parquet(file_path, index=False)
+
+
+class SqliteSource(DataSource):
+    """Reads table `<worksheet_name>` of the database `<path>/<workbook_name>.sqlite`, in insertion order."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self, workbook_name):
+        return closing(sqlite3.connect(os.path.join(self.path, f"{workbook_name}.sqlite")))
+
+    def get_sheet_data(self, workbook_name, worksheet_name):
+        return self.get_sheet_rows(workbook_name, worksheet_name)
+
+    def get_sheet_rows(self, workbook_name, worksheet_name, start_row=2):
+        with self._connect(workbook_name) as connection:
+            return pd.read_sql_query(
+                f'SELECT * FROM "{worksheet_name}" ORDER BY rowid LIMIT -1 OFFSET ?',
+                connection,
+                params=(start_row - 2,)
+            )
+
+    def write_sheet_data(self, workbook_name, worksheet_name, records: pd.DataFrame):
+        os.makedirs(self.path, exist_ok=True)
+        with self._connect(workbook_name) as connection:
+            records.to_sql(worksheet_name, connection, if_exists="replace", index=False)
+            connection.commit()
+
+
+DATA_SOURCES = {
+    "csv": CsvSource,
+    "parquet": ParquetSource,
+    "sqlite": SqliteSource,
+}
@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+
+
+class MatchupMatrices:
+    """
+    League-wide player x player partner and opponent records, built with one bincount per
+    matrix over the match table. Row `i`, column `j` holds player i's record with (partner)
+    or against (opponent) player j; points are player i's team points.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        player_codes, player_dtype = utils.get_player_codes(df)
+        self.players = list(player_dtype.categories)
+        self.player_codes = {player: code for code, player in enumerate(self.players)}
+        n_players = len(self.players)
+
+        team_1_won = df["winner"].to_numpy() == "team_1"
+        slot_won = np.column_stack([team_1_won, team_1_won, ~team_1_won, ~team_1_won])
+        slot_points = df[["points_team_1", "points_team_1", "points_team_2", "points_team_2"]].to_numpy()
+
+        def count(rows, columns, weights=None):
+            flat = (rows.astype(np.int64) * n_players + columns).ravel()
+            counts = np.bincount(flat, weights=None if weights is None else weights.ravel(), minlength=n_players * n_players)
+            return counts.astype(np.int32).reshape(n_players, n_players)
+
+        partner_codes = player_codes[:, [1, 0, 3, 2]]
+        self.partner_games = count(player_codes, partner_codes)
+        self.partner_wins = count(player_codes, partner_codes, slot_won)
+        self.partner_points = count(player_codes, partner_codes, slot_points)
+
+        players_twice = player_codes[:, [0, 0, 1, 1, 2, 2, 3, 3]]
+        opponent_codes = player_codes[:, [2, 3, 2, 3, 0, 1, 0, 1]]
+        self.opponent_games = count(players_twice, opponent_codes)
+        self.opponent_wins = count(players_twice, opponent_codes, slot_won[:, [0, 0, 1, 1, 2, 2, 3, 3]])
+        self.opponent_points = count(players_twice, opponent_codes, slot_points[:, [0, 0, 1, 1, 2, 2, 3, 3]])
+
+    def _record_table(self, player, games, wins, points, index_name):
+        code = self.player_codes.get(player)
+        if code is None:
+            return pd.DataFrame(columns=["total_games", "wins", "average_ppg", "win_pct"], index=pd.Index([], name=index_name))
+
+        played = np.flatnonzero(games[code])
+        record = pd.DataFrame({
+            "total_games": games[code, played],
+            "wins": wins[code, played],
+            "average_ppg": np.round(points[code, played] / games[code, played], 2),
+        }, index=pd.Index(np.array(self.players, dtype=object)[played], name=index_name))
+        record["win_pct"] = np.round(record["wins"] * 100 / record["total_games"], 2)
+        return record
+
+    def get_partner_table(self, player):
+        return self._record_table(player, self.partner_games, self.partner_wins, self.partner_points, "partner")
+
+    def get_opponent_table(self, player):
+        return self._record_table(player, self.opponent_games, self.opponent_wins, self.opponent_points, "opponent")
+
+    def get_rivalry(self, player, rival):
+        """Head-to-head record of `player` against `rival`, plus their record as partners."""
+        code, rival_code = self.player_codes.get(player), self.player_codes.get(rival)
+        if code is None or rival_code is None:
+            return dict(games_against=0, wins=0, losses=0, points_for=0, points_against=0, games_together=0, wins_together=0)
+
+        games_against = int(self.opponent_games[code, rival_code])
+        return dict(
+            games_against=games_against,
+            wins=int(self.opponent_wins[code, rival_code]),
+            losses=games_against - int(self.opponent_wins[code, rival_code]),
+            points_for=int(self.opponent_points[code, rival_code]),
+            points_against=int(self.opponent_points[rival_code, code]),
+            games_together=int(self.partner_games[code, rival_code]),
+            wins_together=int(self.partner_wins[code, rival_code]),
+        )
+
+    def get_best_partnerships(self, min_games=5, top=10):
+        first, second = np.nonzero(np.triu(self.partner_games >= min_games, k=1))
+        games = self.partner_games[first, second]
+        wins = self.partner_wins[first, second]
+        players = np.array(self.players, dtype=object)
+
+        partnerships = pd.DataFrame({
+            "player_1": players[first],
+            "player_2": players[second],
+            "total_games": games,
+            "wins": wins,
+            "win_pct": np.round(wins * 100 / games, 2),
+        })
+        return partnerships.sort_values(["win_pct", "total_games"], ascending=False).head(top).reset_index(drop=True)
+
+
+@profiling.profiled()
+@utils.cache_by_data_version()
+def get_matchups(df: pd.DataFrame) -> MatchupMatrices:
+    return MatchupMatrices(df)
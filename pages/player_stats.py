@@ -3,26 +3,49 @@ import pandas as pd
 import numpy as np
 from sections import individual_stats
 import utils
+import profiling
+import player_index
 
-df = utils.get_data()
-all_players = list(np.unique(df[["team_1_player_1", "team_1_player_2", "team_2_player_1", "team_2_player_2"]].values))
+if st.sidebar.button("Refresh data"):
+    utils.refresh_data()
+with profiling.profile_run(st.sidebar, st.sidebar.checkbox("Profile this page", value=profiling.DEFAULT_ENABLED), name="player_stats"):
+    df = utils.select_time_window(st.sidebar, utils.get_data())
+    if df.empty:
+        st.info("No games were played in this time window.")
+        st.stop()
+    index = player_index.get_player_index(df)
+    all_players = index.players
 
 
-cols = st.columns([3, 1])
-cols[0].title('Individual stats')
+    cols = st.columns([3, 1])
+    cols[0].title('Individual stats')
 
-player = cols[1].selectbox(label="Player Name", options=all_players)
-st.markdown("<hr>", unsafe_allow_html=True)
+    player = cols[1].selectbox(label="Player Name", options=all_players)
+    st.markdown("<hr>", unsafe_allow_html=True)
 
-player_matches = utils.get_player_stats(player, df)
-individual_stats.display_player_win_loss_stats(player_matches)
+    individual_stats.display_player_win_loss_stats(df, player)
 
 
-### Partner wise stats
-st.markdown("<hr><h6>Player - Partner stats</h6>", unsafe_allow_html=True)
-individual_stats.display_player_partner_stats(player_matches, player)
+    ### Rating history
+    st.markdown("<hr><h6>Player - Rating history</h6>", unsafe_allow_html=True)
+    individual_stats.display_player_rating_stats(df, player)
 
 
-### Player Daily stats
-st.markdown("<hr><h6>Player - Date wise stats</h6>", unsafe_allow_html=True)
-individual_stats.display_player_daily_stats(player_matches, player)
\ No newline at end of file
+    ### Streaks and rolling form
+    st.markdown("<hr><h6>Player - Streaks and form</h6>", unsafe_allow_html=True)
+    individual_stats.display_player_streak_stats(df, player)
+
+
+    ### Partner wise stats
+    st.markdown("<hr><h6>Player - Partner stats</h6>", unsafe_allow_html=True)
+    individual_stats.display_player_partner_stats(df, player)
+
+
+    ### Head to head stats
+    st.markdown("<hr><h6>Player - Opponent stats</h6>", unsafe_allow_html=True)
+    individual_stats.display_player_head_to_head_stats(df, player)
+
+
+    ### Player Daily stats
+    st.markdown("<hr><h6>Player - Date wise stats</h6>", unsafe_allow_html=True)
+    individual_stats.display_player_daily_stats(df, player)
@@ -0,0 +1,48 @@
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+
+
+class PlayerIndex:
+    """
+    Player appearances grouped by player, so a player's matches are a contiguous slice
+    instead of a scan over the whole match table.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        appearances = utils.get_player_appearances(df)
+
+        codes, players = pd.factorize(appearances["player"], sort=True)
+        order = np.argsort(codes, kind="stable")
+        self.appearances = appearances.iloc[order].reset_index(drop=True)
+
+        stops = np.cumsum(np.bincount(codes, minlength=len(players)))
+        starts = stops - np.bincount(codes, minlength=len(players))
+        self.players = list(players)
+        self.offsets = dict(zip(self.players, zip(starts, stops)))
+
+    def get_player_appearances(self, player):
+        start, stop = self.offsets.get(player, (0, 0))
+        return self.appearances.iloc[start:stop]
+
+    def get_player_matches(self, player):
+        """Same frame as `utils.get_player_stats`, plus `partner`, `opponent_1` and `opponent_2` columns."""
+        player_appearances = self.get_player_appearances(player)
+        player_matches = self.df.iloc[player_appearances["match"].to_numpy()].copy()
+
+        player_matches["belongs_to"] = player_appearances["belongs_to"].to_numpy()
+        player_matches["player_team_points"] = player_appearances["player_team_points"].to_numpy()
+        player_matches["result"] = np.where(player_appearances["is_win"].to_numpy() == 1, "win", "loss")
+        player_matches["is_win"] = player_appearances["is_win"].to_numpy()
+        for column in ["partner", "opponent_1", "opponent_2"]:
+            player_matches[column] = player_appearances[column].to_numpy()
+
+        return player_matches
+
+
+@profiling.profiled()
+@utils.cache_by_data_version()
+def get_player_index(df: pd.DataFrame) -> PlayerIndex:
+    return PlayerIndex(df)
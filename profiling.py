@@ -0,0 +1,152 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import pandas as pd
+
+DEFAULT_ENABLED = os.environ.get("PROFILING", "") not in ("", "0")
+PROFILING_LOG = os.environ.get("PROFILING_LOG")
+
+_local = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_runs = 0
+
+
+def is_enabled():
+    return getattr(_local, "enabled", False)
+
+
+def start_run(enabled=DEFAULT_ENABLED, name=""):
+    """
+    Starts recording spans for the current script run (Streamlit runs each session's script in its
+    own thread). Peak memory is tracked with tracemalloc, which is process-wide, so with several
+    sessions profiling at once the peaks include each other's allocations.
+    """
+    global _tracing_runs
+    end_run()
+    if not enabled:
+        return
+    with _tracing_lock:
+        if _tracing_runs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_runs += 1
+    _local.enabled = True
+    _local.run = dict(name=name, started_at=datetime.now(timezone.utc).isoformat())
+    _local.spans = []
+    _local.stack = []
+
+
+def end_run():
+    """Stops recording and returns the run's spans (empty if it was not profiled)."""
+    global _tracing_runs
+    if not is_enabled():
+        return []
+    _local.enabled = False
+    with _tracing_lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0:
+            tracemalloc.stop()
+
+    spans = _local.spans
+    if PROFILING_LOG:
+        with open(PROFILING_LOG, "a") as f:
+            for record in spans:
+                f.write(json.dumps({**_local.run, **record}) + "\n")
+    return spans
+
+
+@contextmanager
+def span(name, rows=None):
+    """Records the wall time, peak traced memory and (optional) row count of the block."""
+    if not is_enabled():
+        yield {}
+        return
+
+    stack = _local.stack
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+    tracemalloc.reset_peak()
+    record = dict(name=name, depth=len(stack), seconds=None, rows=rows, peak_memory_bytes=None)
+    _local.spans.append(record)
+    frame = dict(start_memory=current, peak=current)
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        stack.pop()
+        frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+        record["peak_memory_bytes"] = frame["peak"] - frame["start_memory"]
+
+
+def _rows(args, result):
+    for value in (*args, result):
+        if isinstance(value, pd.DataFrame):
+            return value.shape[0]
+    return None
+
+
+def profiled(name=None):
+    """
+    Decorator recording a span per call, named `module.qualname` by default. The row count is taken
+    from the first DataFrame argument, else from the result. A single flag check when disabled.
+    """
+    def decorator(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            with span(span_name) as record:
+                result = fn(*args, **kwargs)
+                record["rows"] = _rows(args, result)
+                return result
+        return wrapper
+    return decorator
+
+
+def get_profile_df(spans):
+    profile_df = pd.DataFrame(spans, columns=["name", "depth", "seconds", "rows", "peak_memory_bytes"])
+    profile_df["name"] = ["· " * depth + name for depth, name in zip(profile_df["depth"], profile_df["name"])]
+    profile_df["ms"] = (profile_df["seconds"] * 1000).round(1)
+    profile_df["peak_mib"] = (profile_df["peak_memory_bytes"] / 2 ** 20).round(2)
+    return profile_df[["name", "ms", "rows", "peak_mib"]]
+
+
+@contextmanager
+def profile_run(container, enabled=DEFAULT_ENABLED, name=""):
+    """
+    Profiles the block as one run and shows it in `container`. The run is ended even when the
+    block raises, including Streamlit's `st.stop()` and rerun exceptions, so tracemalloc is not
+    left on.
+    """
+    start_run(enabled, name)
+    try:
+        yield
+    finally:
+        display_profile(container)
+
+
+def display_profile(container):
+    """Ends the run and shows its spans, nested under the span they ran in, with a JSON export."""
+    run = getattr(_local, "run", {})
+    spans = end_run()
+    if not spans:
+        return
+    container.markdown("<h6>Profile</h6>", unsafe_allow_html=True)
+    container.dataframe(get_profile_df(spans), use_container_width=True)
+    container.download_button(
+        "Download profile",
+        json.dumps({**run, "spans": spans}, indent=2),
+        file_name="profile.json",
+        mime="application/json",
+    )
@@ -0,0 +1,130 @@
+import math
+import threading
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+
+INITIAL_RATING = 1500
+K_FACTOR = 32
+
+
+class RatingEngine:
+    """
+    Doubles Elo ratings, updated match by match in date order.
+
+    A team is rated as the mean of its two players. Both players of a team gain (or lose) the
+    same amount, scaled by the point margin and damped when the stronger team wins, as in
+    FiveThirtyEight's margin-of-victory Elo. Only rows appended since the previous `update`
+    are processed, unless they predate matches already rated, in which case everything is
+    replayed.
+    """
+
+    def __init__(self, initial_rating=INITIAL_RATING, k_factor=K_FACTOR):
+        self.lock = threading.Lock()
+        self.initial_rating = initial_rating
+        self.k_factor = k_factor
+        self._reset()
+
+    def _reset(self):
+        """Forgets every rated match. Callers hold `lock`, which is kept."""
+        self.player_ids = {}
+        self.players = []
+        self.ratings = []
+        self.n_rows = 0
+        self.rows_digest = None
+        self.data_version = None
+        self.last_date = None
+        self._matches, self._dates, self._player_ids, self._changes = [], [], [], []
+        self._history = None
+
+    def _extends_seen_rows(self, df: pd.DataFrame):
+        return df.shape[0] >= self.n_rows and (self.n_rows == 0 or utils.get_rows_digest(df, self.n_rows) == self.rows_digest)
+
+    def _player_id(self, player):
+        if player not in self.player_ids:
+            self.player_ids[player] = len(self.players)
+            self.players.append(player)
+            self.ratings.append(float(self.initial_rating))
+        return self.player_ids[player]
+
+    def update(self, df: pd.DataFrame):
+        data_version = utils.get_data_version(df)
+        if data_version == self.data_version:
+            return self
+        if not self._extends_seen_rows(df):
+            self._reset()
+        new_rows = df.iloc[self.n_rows:]
+        if new_rows.empty:
+            self.data_version = data_version
+            return self
+        if self.last_date is not None and new_rows["date"].min() < self.last_date:
+            self._reset()
+            new_rows = df
+
+        order = np.argsort(new_rows["date"].to_numpy(), kind="stable")
+        player_codes, player_dtype = utils.get_player_codes(new_rows)
+        player_ids = np.array([self._player_id(player) for player in player_dtype.categories])[player_codes[order]]
+        points_team_1 = new_rows["points_team_1"].to_numpy()[order]
+        points_team_2 = new_rows["points_team_2"].to_numpy()[order]
+
+        ratings, k_factor = self.ratings, self.k_factor
+        changes = np.empty(len(order))
+        for i, ((a, b, c, d), score_1, score_2) in enumerate(zip(player_ids.tolist(), points_team_1.tolist(), points_team_2.tolist())):
+            rating_gap = (ratings[a] + ratings[b] - ratings[c] - ratings[d]) / 2
+            expected = 1 / (1 + 10 ** (-rating_gap / 400))
+            if score_1 > score_2:
+                change = k_factor * (1 - expected) * math.log(score_1 - score_2 + 1) * 2.2 / (rating_gap * 0.001 + 2.2)
+            else:
+                change = -k_factor * expected * math.log(score_2 - score_1 + 1) * 2.2 / (-rating_gap * 0.001 + 2.2)
+            ratings[a] += change
+            ratings[b] += change
+            ratings[c] -= change
+            ratings[d] -= change
+            changes[i] = change
+
+        self._matches.append(np.arange(self.n_rows, df.shape[0])[order])
+        self._dates.append(new_rows["date"].to_numpy()[order])
+        self._player_ids.append(player_ids)
+        self._changes.append(changes)
+        self._history = None
+
+        self.n_rows = df.shape[0]
+        self.rows_digest = utils.get_rows_digest(df)
+        self.data_version = data_version
+        self.last_date = self._dates[-1][-1]
+        return self
+
+    def get_ratings(self):
+        return pd.Series(self.ratings, index=pd.Index(self.players, name="player"), name="rating")
+
+    def get_history(self):
+        """One row per player per rated match, in the order matches were rated, with the rating after it."""
+        if self._history is None:
+            changes = np.concatenate(self._changes) if self._changes else np.empty(0)
+            player_ids = np.concatenate(self._player_ids) if self._player_ids else np.empty((0, 4), dtype=int)
+            history = pd.DataFrame({
+                "match": np.repeat(np.concatenate(self._matches) if self._matches else np.empty(0, dtype=int), 4),
+                "date": np.repeat(np.concatenate(self._dates) if self._dates else np.empty(0, dtype="datetime64[ns]"), 4),
+                "player": pd.Categorical.from_codes(player_ids.ravel(), categories=self.players),
+                "rating_change": (changes[:, None] * np.array([1, 1, -1, -1])).ravel(),
+            })
+            history["rating"] = self.initial_rating + history.groupby("player", observed=True)["rating_change"].cumsum()
+            self._history = history
+        return self._history
+
+    def get_player_history(self, player):
+        history = self.get_history()
+        if player not in self.player_ids:
+            return history.iloc[:0]
+        return history[history["player"].cat.codes.to_numpy() == self.player_ids[player]]
+
+
+_engines = utils.WindowedInstances(RatingEngine)
+
+
+@profiling.profiled()
+def get_rating_engine(df: pd.DataFrame) -> RatingEngine:
+    engine = _engines.get(df)
+    with engine.lock:
+        return engine.update(df)
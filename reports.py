@@ -0,0 +1,209 @@
+"""
+Writes static HTML and JSON reports for the league and for every player, without Streamlit.
+
+    DATA_SOURCE=parquet DATA_SOURCE_PATH=data python reports.py --output reports
+
+The match table is loaded and indexed once; player reports are rendered on a process pool whose
+workers inherit it. A player's report is only rewritten when the hash of their matches and rating
+history differs from the one in `manifest.json`, unless `--force` is given.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import utils
+import player_index
+import aggregates
+import ratings
+import matchups
+import streaks
+from sections import leaderboard, partnerships, datewise_stats, venue_section, individual_stats
+
+REPORT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+_df = None
+
+
+def _write_report(path, title, sections, data):
+    """`sections` is a list of (heading, figures); the JSON gets `data` as is."""
+    figure_html = []
+    include_plotlyjs = "cdn"
+    for heading, figures in sections:
+        figure_html.append(f"<h3>{heading}</h3>")
+        for figure in figures:
+            figure_html.append(figure.to_html(full_html=False, include_plotlyjs=include_plotlyjs))
+            include_plotlyjs = False
+
+    with open(f"{path}.html", "w") as f:
+        f.write(f"<html><head><meta charset=\"utf-8\"><title>{title}</title></head><body><h1>{title}</h1>{''.join(figure_html)}</body></html>")
+    with open(f"{path}.json", "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _warm(df: pd.DataFrame):
+    """Builds the shared per-data-version structures, so forked workers start with them."""
+    player_index.get_player_index(df)
+    aggregates.get_aggregate_store(df)
+    ratings.get_rating_engine(df)
+    matchups.get_matchups(df)
+    streaks.get_streaks(df)
+
+
+def _init_worker(df: pd.DataFrame):
+    global _df
+    _df = df
+    _warm(df)
+
+
+def player_file_name(player):
+    return re.sub(r"[^a-z0-9]+", "_", f"{player}".lower()).strip("_")
+
+
+def get_player_hash(df: pd.DataFrame, player):
+    player_matches = player_index.get_player_index(df).get_player_matches(player)
+    rating_history = ratings.get_rating_engine(df).get_player_history(player)["rating"]
+    digest = hashlib.sha256(f"{REPORT_VERSION}".encode())
+    digest.update(pd.util.hash_pandas_object(player_matches, index=False).to_numpy().tobytes())
+    digest.update(rating_history.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def write_league_report(df: pd.DataFrame, output_dir):
+    leaderboard_df = leaderboard.get_leaderboard_df(df)
+    best_partnerships_df = partnerships.get_best_partnerships_df(df)
+    date_df = datewise_stats.get_date_df(df)
+    venue_stats_df = venue_section.get_venue_stats_df(df)
+
+    _write_report(
+        os.path.join(output_dir, "league"),
+        "Badminton Tracking",
+        [
+            ("Leaderboard", [leaderboard.create_leaderboard_figure(leaderboard_df)]),
+            ("Best Partnerships", [partnerships.create_best_partnerships_figure(best_partnerships_df)]),
+            ("Date Wise stats", [datewise_stats.create_date_table_figure(date_df)]),
+            ("Venue Wise stats", [
+                venue_section.create_venue_bar_chart(venue_section.get_venue_point_bins_df(df)),
+                venue_section.create_venue_pie_chart(venue_section.get_venue_games_df(df)),
+            ]),
+        ],
+        {
+            "data_version": utils.get_data_version(df),
+            "total_games": df.shape[0],
+            "leaderboard": utils.get_json_records(leaderboard_df),
+            "best_partnerships": utils.get_json_records(best_partnerships_df),
+            "dates": utils.get_json_records(date_df.reset_index()),
+            "venues": utils.get_json_records(venue_stats_df.reset_index()),
+        },
+    )
+
+
+def write_player_report(player, output_dir, df: pd.DataFrame = None):
+    df = _df if df is None else df
+    win_loss_df = individual_stats.get_player_win_loss_df(df, player)
+    partner_df = individual_stats.get_player_partner_df(df, player)
+    opponent_df = individual_stats.get_player_opponent_df(df, player)
+    daily_summary_df = individual_stats.get_player_daily_summary_df(df, player)
+    rating_history = individual_stats.get_player_rating_history_df(df, player)
+    rolling_form = individual_stats.get_player_rolling_form_df(df, player)
+    streak_summary = individual_stats.get_player_streak_summary(df, player)
+
+    _write_report(
+        os.path.join(output_dir, "players", player_file_name(player)),
+        f"{player}",
+        [
+            ("Overall Stats", [individual_stats.create_win_loss_pie(win_loss_df), individual_stats.create_player_performance_figure(win_loss_df)]),
+            ("Rating history", [individual_stats.create_rating_history_chart(rating_history, player)]),
+            ("Streaks and form", [individual_stats.create_rolling_form_chart(rolling_form, player, streaks.ROLLING_WINDOW)]),
+            ("Partner stats", [individual_stats.create_partner_table_figure(partner_df), individual_stats.create_partner_bar_chart(partner_df)]),
+            ("Opponent stats", [individual_stats.create_opponent_table_figure(opponent_df)]),
+            ("Date wise stats", [
+                individual_stats.create_daily_bar_chart(individual_stats.get_player_daily_df(df, player), player),
+                individual_stats.create_daily_table_figure(daily_summary_df),
+            ]),
+        ],
+        {
+            "player": f"{player}",
+            "rating": rating_history["rating"].iloc[-1],
+            "peak_rating": rating_history["rating"].max(),
+            "streaks": json.loads(streak_summary.to_json()),
+            "win_loss": utils.get_json_records(win_loss_df.reset_index()),
+            "partners": utils.get_json_records(partner_df.reset_index()),
+            "opponents": utils.get_json_records(opponent_df.reset_index()),
+            "daily": utils.get_json_records(daily_summary_df),
+        },
+    )
+    return player
+
+
+def read_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"league": None, "players": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_players(df: pd.DataFrame, players=None):
+    """`players` normalized like the match table (default every player); raises ValueError on unknown names."""
+    known = player_index.get_player_index(df).players
+    if not players:
+        return known
+    players = list(dict.fromkeys(utils.normalize_name(player) for player in players))
+    unknown = sorted(set(players) - set(known))
+    if unknown:
+        raise ValueError(f"Unknown players: {', '.join(unknown)}")
+    return players
+
+
+def write_reports(df: pd.DataFrame, output_dir, players=None, workers=None, force=False):
+    """Writes the league report and the reports of `players` (default all) that changed. Returns the players written."""
+    players = select_players(df, players)
+    os.makedirs(os.path.join(output_dir, "players"), exist_ok=True)
+    manifest = read_manifest(output_dir)
+    _warm(df)
+
+    data_version = utils.get_data_version(df)
+    if force or manifest["league"] != data_version:
+        write_league_report(df, output_dir)
+        manifest["league"] = data_version
+
+    player_hashes = {player: get_player_hash(df, player) for player in players}
+    stale = [
+        player for player in players
+        if force or manifest["players"].get(player) != player_hashes[player]
+        or not os.path.exists(os.path.join(output_dir, "players", f"{player_file_name(player)}.html"))
+    ]
+
+    if stale:
+        chunksize = max(1, len(stale) // (4 * (workers or os.cpu_count())))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as pool:
+            for player in pool.map(write_player_report, stale, [output_dir] * len(stale), chunksize=chunksize):
+                manifest["players"][player] = player_hashes[player]
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports")
+    parser.add_argument("--players", nargs="+", help="defaults to every player")
+    parser.add_argument("--workers", type=int, help="defaults to the number of CPUs")
+    parser.add_argument("--force", action="store_true", help="rewrite reports even if unchanged")
+    args = parser.parse_args()
+
+    df = utils.prepare_match_table(utils.load_records(utils.get_data_source()))
+    try:
+        written = write_reports(df, args.output, players=args.players, workers=args.workers, force=args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"League report and {len(written)} player reports written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,25 +3,30 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 import utils
+import profiling
+import aggregates
 
-def display_date_section(df):
-    date_cols = st.columns([3, 2])
-
-    date_df = df.groupby("date").agg(**{
-        "total_games": pd.NamedAgg("date", "count"),
-        "average_ppg": pd.NamedAgg("total_points_per_game", "mean"),
-    })
-    date_df["average_ppg"] = round(date_df["average_ppg"], 2)
+def get_date_df(df):
+    return aggregates.get_aggregate_store(df).get_date_df()
 
+@profiling.profiled()
+def create_date_table_figure(date_df):
     date_stats_fig = utils.create_go_table_figure(date_df.reset_index())
     date_stats_fig.update_layout(width=450, margin=dict(b=0))
+    return date_stats_fig
+
+@profiling.profiled()
+def display_date_section(df):
+    date_cols = st.columns([3, 2])
+
+    date_df = get_date_df(df)
 
-    date_cols[0].plotly_chart(date_stats_fig)
+    utils.display_paginated_table(date_cols[0], date_cols[1], date_df, key="date_table", create_figure=create_date_table_figure)
     date_cols[1].markdown(f"""
         <div style="margin-left: 20px">
             <h6>Most games played in a day:</h6>
-            <h2>{date_df['total_games'].max()} Games on {date_df['total_games'].idxmax()}</h2>
+            <h2>{date_df['total_games'].max()} Games on {date_df['total_games'].idxmax():{utils.DISPLAY_DATE_FORMAT}}</h2>
         </div>
         """, 
         unsafe_allow_html=True
-    )
\ No newline at end of file
+    )
@@ -4,15 +4,17 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import utils
+import profiling
+import aggregates
+import ratings
+import matchups
+import streaks
 
-def display_player_win_loss_stats(player_matches: pd.DataFrame):
-    player_win_loss_columns = st.columns([3, 1, 2])
-    player_win_loss_df = player_matches.groupby("result").agg(**{
-        "total_games": pd.NamedAgg("result", "count"), 
-        "average_ppg": pd.NamedAgg("player_team_points", "mean"),
-        **{f"{fn}_margin": pd.NamedAgg("margin", fn) for fn in ["mean", "max", "min"]}
-    })
+def get_player_win_loss_df(df: pd.DataFrame, player):
+    return aggregates.get_aggregate_store(df).get_player_win_loss_df(player)
 
+@profiling.profiled()
+def create_win_loss_pie(player_win_loss_df):
     win_loss_pie = px.pie(
         player_win_loss_df,
         values="total_games",
@@ -23,52 +25,42 @@ def display_player_win_loss_stats(player_matches: pd.DataFrame):
         hole=0.3
     )
     win_loss_pie.update_layout(width=300, showlegend=False, margin=dict(l=50, b=0, t=0))
-    player_win_loss_columns[2].plotly_chart(
-        win_loss_pie
-    )
+    return win_loss_pie
 
-    player_win_loss_columns[0].markdown('<h6 style="margin-top: 40px">Overall Stats:</h6>', unsafe_allow_html=True)
+@profiling.profiled()
+def create_player_performance_figure(player_win_loss_df):
     player_performance_fig = utils.create_go_table_figure(player_win_loss_df.T.reset_index())
     player_performance_fig.update_traces(header_values=['Metric', 'During Losses', 'During Wins'])
     player_performance_fig.update_layout(margin=dict(t=0, b=0), height=400)
+    return player_performance_fig
+
+@profiling.profiled()
+def display_player_win_loss_stats(df: pd.DataFrame, player):
+    player_win_loss_columns = st.columns([3, 1, 2])
+    player_win_loss_df = get_player_win_loss_df(df, player)
+
+    player_win_loss_columns[2].plotly_chart(
+        create_win_loss_pie(player_win_loss_df)
+    )
+
+    player_win_loss_columns[0].markdown('<h6 style="margin-top: 40px">Overall Stats:</h6>', unsafe_allow_html=True)
     player_win_loss_columns[0].plotly_chart(
-        player_performance_fig
+        create_player_performance_figure(player_win_loss_df)
     )
     # player_win_loss_columns[1].table(player_win_loss_df.T)
 
-def display_player_partner_stats(player_matches: pd.DataFrame, player):
-    player_partner_cols = st.columns([2, 1])
-
-    player_matches['partner'] = np.where(
-        player_matches["belongs_to"] == 'team_1',
-        np.where(
-            player_matches["team_1_player_1"] == player,
-            player_matches["team_1_player_2"],
-            player_matches["team_1_player_1"]
-        ),
-        np.where(
-            player_matches["team_2_player_1"] == player,
-            player_matches["team_2_player_2"],
-            player_matches["team_2_player_1"]
-        ),
-    )
-
-    player_partner_stats = player_matches.groupby(["partner"]).agg(**{
-        "total_games": pd.NamedAgg("result", "count"), 
-        "wins": pd.NamedAgg("is_win", "sum"),
-        "average_ppg": pd.NamedAgg("player_team_points", "mean")
-    })
-    player_partner_stats["win_pct"] = round(player_partner_stats['wins'] * 100 / player_partner_stats['total_games'], 2)
-    player_partner_stats["average_ppg"] = round(player_partner_stats["average_ppg"], 2)
+def get_player_partner_df(df: pd.DataFrame, player):
+    return aggregates.get_aggregate_store(df).get_player_partner_df(player)
 
-    player_partner_cols[0].markdown('<h6 style="margin-top: 40px">Partnerwise Stats:</h6>', unsafe_allow_html=True)
+@profiling.profiled()
+def create_partner_table_figure(player_partner_stats):
     player_partner_table_fig = utils.create_go_table_figure(player_partner_stats.reset_index())
     player_partner_table_fig.update_traces(columnwidth=[1, 1, 1, 1, 2], cells_fill_color=[np.where(player_partner_stats['win_pct'] == player_partner_stats['win_pct'].max(), '#b5de2b', '#eceff1')])
     player_partner_table_fig.update_layout(margin=dict(t=0,b=0))
+    return player_partner_table_fig
 
-    player_partner_cols[0].plotly_chart(player_partner_table_fig)
-    # player_partner_cols[0].table(player_partner_stats)
-
+@profiling.profiled()
+def create_partner_bar_chart(player_partner_stats):
     partner_list = player_partner_stats.index.to_list()
     bar_colors = ['lightslategrey' for i in range(player_partner_stats.shape[0])]
     bar_colors[partner_list.index(player_partner_stats['win_pct'].idxmax())] = '#b5de2b'
@@ -87,20 +79,38 @@ def display_player_partner_stats(player_matches: pd.DataFrame, player):
         title_text="Partnerwise win percentages",
         width=300
     )
+    return partner_bar_chart
+
+@profiling.profiled()
+def display_player_partner_stats(df: pd.DataFrame, player):
+    player_partner_cols = st.columns([2, 1])
+
+    player_partner_stats = get_player_partner_df(df, player)
+
+    player_partner_cols[0].markdown('<h6 style="margin-top: 40px">Partnerwise Stats:</h6>', unsafe_allow_html=True)
+    utils.display_paginated_table(
+        player_partner_cols[0],
+        player_partner_cols[1],
+        player_partner_stats,
+        key="partner_table",
+        create_figure=create_partner_table_figure,
+        highlight=player_partner_stats['win_pct'] == player_partner_stats['win_pct'].max(),
+    )
+    # player_partner_cols[0].table(player_partner_stats)
 
     player_partner_cols[1].plotly_chart(
-        partner_bar_chart
+        create_partner_bar_chart(player_partner_stats)
     )
 
-def display_player_daily_stats(player_matches: pd.DataFrame, player):
-    daily_stat_cols = st.columns([4, 2])
-    daily_performance = player_matches.groupby(["date", "result"]).agg(**{
-        "total_games": pd.NamedAgg("result", "count"), 
-        "average_ppg": pd.NamedAgg("player_team_points", "mean"),
-        **{f"{fn}_margin": pd.NamedAgg("margin", fn) for fn in ["mean", "max", "min"]}
-    })
+def get_player_daily_df(df: pd.DataFrame, player):
+    return aggregates.get_aggregate_store(df).get_player_daily_df(player)
 
-    daily_performance_bar_chart = px.bar(
+def get_player_daily_summary_df(df: pd.DataFrame, player):
+    return aggregates.get_aggregate_store(df).get_player_daily_summary_df(player)
+
+@profiling.profiled()
+def create_daily_bar_chart(daily_performance, player):
+    return px.bar(
         daily_performance.reset_index(),
         x='date',
         y='total_games',
@@ -113,24 +123,145 @@ def display_player_daily_stats(player_matches: pd.DataFrame, player):
         width=400
     )
 
-    daily_stat_cols[0].markdown('<h6 style="margin-top: 40px">Daily Stats:</h6>', unsafe_allow_html=True)
-
-    daily_performance_res_ignored = player_matches.groupby(["date"]).agg(**{
-        "total_games": pd.NamedAgg("result", "count"), 
-        "wins": pd.NamedAgg("is_win", "sum"),
-        "average_ppg": pd.NamedAgg("player_team_points", "mean")
-    }).reset_index()
-    daily_performance_res_ignored['win_pct'] = round(daily_performance_res_ignored['wins'] * 100 / daily_performance_res_ignored['total_games'], 2)
-    daily_performance_res_ignored["average_ppg"] = round(daily_performance_res_ignored["average_ppg"], 2)
-
+@profiling.profiled()
+def create_daily_table_figure(daily_performance_res_ignored):
     daily_performance_table_fig = utils.create_go_table_figure(daily_performance_res_ignored)
     daily_performance_table_fig.update_traces(columnwidth=[2, 2, 2, 2, 3])
+    return daily_performance_table_fig
 
+@profiling.profiled()
+def display_player_daily_stats(df: pd.DataFrame, player):
+    daily_stat_cols = st.columns([4, 2])
+    daily_performance_bar_chart = create_daily_bar_chart(get_player_daily_df(df, player), player)
 
-    daily_stat_cols[0].plotly_chart(
-        daily_performance_table_fig
-    )
+    daily_stat_cols[0].markdown('<h6 style="margin-top: 40px">Daily Stats:</h6>', unsafe_allow_html=True)
+
+    daily_summary = get_player_daily_summary_df(df, player)
+    utils.display_paginated_table(daily_stat_cols[0], daily_stat_cols[1], daily_summary, key="daily_table", create_figure=create_daily_table_figure)
 
     daily_stat_cols[1].plotly_chart(
         daily_performance_bar_chart
-    )
\ No newline at end of file
+    )
+
+def get_player_rating_history_df(df: pd.DataFrame, player):
+    return ratings.get_rating_engine(df).get_player_history(player)
+
+@profiling.profiled()
+def create_rating_history_chart(rating_history, player):
+    rating_history_chart = px.line(
+        rating_history.reset_index(drop=True).reset_index(),
+        x="index",
+        y="rating",
+        hover_data=["date", "rating_change"],
+        template="simple_white",
+        color_discrete_sequence=['#b5de2b'],
+        title=f"{player}'s Rating",
+        height=300,
+    )
+    rating_history_chart.update_layout(xaxis_title="Games played", yaxis_title="Rating")
+    return rating_history_chart
+
+@profiling.profiled()
+def display_player_rating_stats(df: pd.DataFrame, player):
+    rating_cols = st.columns([4, 2])
+    rating_history = get_player_rating_history_df(df, player)
+
+    rating_cols[0].plotly_chart(
+        create_rating_history_chart(rating_history, player)
+    )
+    rating_cols[1].markdown(f"""
+        <div style="margin-top: 40px">
+            <h6>Current rating:</h6>
+            <h2>{rating_history['rating'].iloc[-1]:.0f}</h2>
+            <h6>Peak rating: {rating_history['rating'].max():.0f}</h6>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def get_player_opponent_df(df: pd.DataFrame, player):
+    return matchups.get_matchups(df).get_opponent_table(player)
+
+@profiling.profiled()
+def create_opponent_table_figure(player_opponent_stats):
+    player_opponent_table_fig = utils.create_go_table_figure(player_opponent_stats.reset_index())
+    player_opponent_table_fig.update_traces(columnwidth=[1, 1, 1, 1, 2], cells_fill_color=[np.where(player_opponent_stats['win_pct'] == player_opponent_stats['win_pct'].max(), '#b5de2b', '#eceff1')])
+    player_opponent_table_fig.update_layout(margin=dict(t=0,b=0))
+    return player_opponent_table_fig
+
+@profiling.profiled()
+def display_player_head_to_head_stats(df: pd.DataFrame, player):
+    head_to_head_cols = st.columns([2, 1])
+
+    player_opponent_stats = get_player_opponent_df(df, player)
+
+    head_to_head_cols[0].markdown('<h6 style="margin-top: 40px">Opponentwise Stats:</h6>', unsafe_allow_html=True)
+    utils.display_paginated_table(
+        head_to_head_cols[0],
+        head_to_head_cols[1],
+        player_opponent_stats,
+        key="opponent_table",
+        create_figure=create_opponent_table_figure,
+        highlight=player_opponent_stats['win_pct'] == player_opponent_stats['win_pct'].max(),
+    )
+
+    rival = head_to_head_cols[1].selectbox(label="Rival", options=player_opponent_stats.index.to_list())
+    rivalry = matchups.get_matchups(df).get_rivalry(player, rival)
+    head_to_head_cols[1].markdown(f"""
+        <div style="margin-top: 20px">
+            <h6>{player} vs {rival}:</h6>
+            <h2>{rivalry['wins']} - {rivalry['losses']}</h2>
+            <h6>Points: {rivalry['points_for']} - {rivalry['points_against']}</h6>
+            <h6>Together: {rivalry['wins_together']} wins in {rivalry['games_together']} games</h6>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def get_player_streak_summary(df: pd.DataFrame, player):
+    return streaks.get_streaks(df).get_summary().loc[player]
+
+def get_player_rolling_form_df(df: pd.DataFrame, player, window=streaks.ROLLING_WINDOW):
+    return streaks.get_streaks(df).get_player_rolling_win_pct(player, window)
+
+@profiling.profiled()
+def create_rolling_form_chart(rolling_form, player, window):
+    rolling_form_chart = go.Figure(
+        go.Scatter(
+            y=rolling_form["rolling_win_pct"],
+            customdata=np.datetime_as_string(rolling_form["date"].to_numpy(), unit="D"),
+            mode="lines",
+            line_color='#b5de2b',
+            hovertemplate="Win Percentage: %{y} %<br>Date: %{customdata}<extra></extra>"
+        )
+    )
+    rolling_form_chart.update_layout(
+        template="simple_white",
+        title_text=f"{player}'s win % over the last {window} games",
+        height=300,
+        xaxis_title="Games played",
+        yaxis_title="Win %",
+        yaxis_range=[0, 100],
+    )
+    return rolling_form_chart
+
+@profiling.profiled()
+def display_player_streak_stats(df: pd.DataFrame, player):
+    streak_cols = st.columns([4, 2])
+    window = streak_cols[1].number_input("Rolling window (games)", min_value=1, max_value=100, value=streaks.ROLLING_WINDOW)
+    streak_summary = get_player_streak_summary(df, player)
+
+    streak_cols[0].plotly_chart(
+        create_rolling_form_chart(get_player_rolling_form_df(df, player, window), player, window)
+    )
+    streak_cols[1].markdown(f"""
+        <div style="margin-top: 20px">
+            <h6>Current streak:</h6>
+            <h2>{streak_summary['streak']}</h2>
+            <h6>Longest winning streak: {streak_summary['longest_win_streak']}</h6>
+            <h6>Longest losing streak: {streak_summary['longest_loss_streak']}</h6>
+            <h6>Form: {streak_summary['form']}</h6>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
@@ -4,27 +4,51 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 import utils
+import profiling
+import player_index
+import ratings
+import streaks
 
 
-def display_leaderboard(df, players_list):
-    leaderboard_cols = st.columns([2, 1])
+@profiling.profiled()
+def get_leaderboard_df(df):
+    appearances = player_index.get_player_index(df).appearances
+    player_groups = appearances.groupby("player", observed=True)
+
+    leaderboard_df = player_groups.agg(**{
+        "total_games": pd.NamedAgg("is_win", "count"),
+        "wins": pd.NamedAgg("is_win", "sum"),
+    })
+    leaderboard_df["wins_pct"] = round(leaderboard_df["wins"] * 100 / leaderboard_df["total_games"], 2)
+
+    player_streaks = streaks.get_streaks(df).get_summary().reindex(leaderboard_df.index.astype(object))
+    leaderboard_df["form"] = player_streaks["form"].to_numpy()
+    leaderboard_df["streak"] = player_streaks["streak"].to_numpy()
+
+    player_ratings = ratings.get_rating_engine(df).get_ratings()
+    leaderboard_df.insert(0, "rating", np.round(player_ratings.reindex(leaderboard_df.index.astype(object)).to_numpy(), 1))
+
+    return leaderboard_df.reset_index().sort_values("rating", ascending=False)
 
-    leaderboard = []
-
-    for player in players_list:
-        player_stats = utils.get_player_stats(player, df)
-        
-        total_games, wins = player_stats.shape[0], player_stats['is_win'].sum()
-        leaderboard.append({
-            "player": player,
-            "total_games": total_games,
-            "wins": wins,
-            "wins_pct": round(wins * 100 / total_games, 2),
-            "form": ' '.join(player_stats['result'][-5:].apply(lambda x: x[0].upper()).to_list())
-        })
-
-    leaderboard_df = pd.DataFrame(leaderboard).sort_values("wins_pct", ascending=False)
+
+@profiling.profiled()
+def create_leaderboard_figure(leaderboard_df):
     leader_board_fig = utils.create_go_table_figure(leaderboard_df)
-    leader_board_fig.update_traces(cells_fill_color=[np.where(leaderboard_df['wins_pct'] == leaderboard_df['wins_pct'].max(), '#b5de2b', '#eceff1')])
+    leader_board_fig.update_traces(cells_fill_color=[np.where(leaderboard_df['rating'] == leaderboard_df['rating'].max(), '#b5de2b', '#eceff1')])
     leader_board_fig.update_layout(margin=dict(t=0))
-    leaderboard_cols[0].plotly_chart(leader_board_fig)
\ No newline at end of file
+    return leader_board_fig
+
+
+@profiling.profiled()
+def display_leaderboard(df):
+    leaderboard_cols = st.columns([2, 1])
+
+    leaderboard_df = get_leaderboard_df(df)
+    utils.display_paginated_table(
+        leaderboard_cols[0],
+        leaderboard_cols[1],
+        leaderboard_df,
+        key="leaderboard",
+        create_figure=create_leaderboard_figure,
+        highlight=leaderboard_df['rating'] == leaderboard_df['rating'].max(),
+    )
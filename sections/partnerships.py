@@ -0,0 +1,24 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+import matchups
+
+def get_best_partnerships_df(df, min_games=5, top=10):
+    return matchups.get_matchups(df).get_best_partnerships(min_games=min_games, top=top)
+
+@profiling.profiled()
+def create_best_partnerships_figure(best_partnerships_df):
+    best_partnerships_fig = utils.create_go_table_figure(best_partnerships_df)
+    best_partnerships_fig.update_traces(cells_fill_color=[np.where(best_partnerships_df.index == 0, '#b5de2b', '#eceff1')])
+    best_partnerships_fig.update_layout(margin=dict(t=0))
+    return best_partnerships_fig
+
+@profiling.profiled()
+def display_best_partnerships(df):
+    partnership_cols = st.columns([2, 1])
+
+    min_games = partnership_cols[1].number_input("Minimum games together", min_value=1, value=5)
+    best_partnerships_df = get_best_partnerships_df(df, min_games=min_games)
+    partnership_cols[0].plotly_chart(create_best_partnerships_figure(best_partnerships_df))
@@ -1,14 +1,22 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+import profiling
+import aggregates
 
-def display_venue_stats(df: pd.DataFrame):
+def get_venue_point_bins_df(df: pd.DataFrame):
+    return aggregates.get_aggregate_store(df).get_venue_point_bins_df()
 
-    venue_cols = st.columns([3, 2])
+def get_venue_games_df(df: pd.DataFrame):
+    return aggregates.get_aggregate_store(df).get_venue_games_df()
+
+def get_venue_stats_df(df: pd.DataFrame):
+    return aggregates.get_aggregate_store(df).get_venue_stats_df()
+
+@profiling.profiled()
+def create_venue_bar_chart(venue_point_bins_df):
     venue_bar_chart = px.bar(
-        df.groupby(["point_bins", "venue"]).agg(**{
-            "total_games": pd.NamedAgg("date", "count")
-        }).reset_index(),
+        venue_point_bins_df,
         x="venue",
         y="total_games",
         color="point_bins",
@@ -19,15 +27,12 @@ def display_venue_stats(df: pd.DataFrame):
     )
 
     venue_bar_chart.update_traces(showlegend=False)
+    return venue_bar_chart
 
-    venue_cols[0].plotly_chart(
-        venue_bar_chart
-    )
-
+@profiling.profiled()
+def create_venue_pie_chart(venue_games_df):
     venue_pie_fig = px.pie(
-        df.groupby(["venue"]).agg(**{
-            "total_games": pd.NamedAgg("date", "count")
-        }).reset_index(),
+        venue_games_df,
         values="total_games",
         names="venue",
         color_discrete_sequence=px.colors.sequential.Viridis_r,
@@ -40,16 +45,22 @@ def display_venue_stats(df: pd.DataFrame):
         showlegend=False
     )
     venue_pie_fig.update_layout(margin=dict(l=100), title=dict(xanchor="center"))
+    return venue_pie_fig
+
+@profiling.profiled()
+def display_venue_stats(df: pd.DataFrame):
+
+    venue_cols = st.columns([3, 2])
+
+    venue_cols[0].plotly_chart(
+        create_venue_bar_chart(get_venue_point_bins_df(df))
+    )
 
     venue_cols[1].plotly_chart(
-        venue_pie_fig
+        create_venue_pie_chart(get_venue_games_df(df))
     )
 
     st.markdown("<h6>Overall Venue stats</h6>", unsafe_allow_html=True)
     st.columns([3, 1])[0].table(
-        df.groupby("venue").agg(**{
-            "total_games": pd.NamedAgg("date", "count"), 
-            "average_ppg": pd.NamedAgg("total_points_per_game", "mean"),
-            **{f"{fn}_margin": pd.NamedAgg("margin", fn) for fn in ["mean", "max", "min"]}
-        })
-    )
\ No newline at end of file
+        get_venue_stats_df(df)
+    )
@@ -0,0 +1,104 @@
+import pandas as pd
+import numpy as np
+import utils
+import profiling
+
+FORM_GAMES = 5
+ROLLING_WINDOW = 10
+
+
+def _rolling_win_pct(is_win, group_starts, window):
+    """Rolling win % over `is_win`, where the window for each position never reaches back past its `group_starts`."""
+    positions = np.arange(len(is_win))
+    wins = np.concatenate([[0], np.cumsum(is_win)])
+    window_starts = np.maximum(positions + 1 - window, group_starts)
+    return np.round((wins[positions + 1] - wins[window_starts]) * 100 / (positions + 1 - window_starts), 2)
+
+
+class Streaks:
+    """
+    Every player's results in chronological order (by date, then sheet order within a day),
+    laid out player after player, with win/loss runs found by run-length encoding the
+    whole sequence at once.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        player_codes, player_dtype = utils.get_player_codes(df)
+        codes = player_codes.ravel()
+        team_1_won = df["winner"].to_numpy() == "team_1"
+        is_win = np.column_stack([team_1_won, team_1_won, ~team_1_won, ~team_1_won]).ravel()
+        matches = np.repeat(np.arange(df.shape[0]), 4)
+        dates = np.repeat(df["date"].to_numpy(), 4)
+
+        order = np.lexsort((matches, dates, codes))
+        self.codes, self.is_win = codes[order], is_win[order].astype(np.int64)
+        self.matches, self.dates = matches[order], dates[order]
+
+        player_starts = np.flatnonzero(np.diff(self.codes, prepend=-1))
+        self.player_starts = player_starts
+        self.player_stops = np.append(player_starts[1:], len(self.codes))
+        self.players = list(np.asarray(player_dtype.categories, dtype=object)[self.codes[player_starts]])
+        self.player_positions = {player: i for i, player in enumerate(self.players)}
+
+        run_starts = np.flatnonzero(np.diff(self.codes, prepend=-1) | np.diff(self.is_win, prepend=-1))
+        self.run_starts = run_starts
+        self.run_lengths = np.diff(np.append(run_starts, len(self.codes)))
+        self.run_wins = self.is_win[run_starts]
+        self.player_first_runs = np.searchsorted(run_starts, player_starts)
+        self._summary = None
+
+    def get_summary(self):
+        """Current streak (positive for wins, negative for losses), longest streaks and recent form per player."""
+        if self._summary is None:
+            self._summary = self._get_summary()
+        return self._summary
+
+    def _get_summary(self):
+        win_lengths = self.run_lengths * self.run_wins
+        loss_lengths = self.run_lengths * (1 - self.run_wins)
+        last_runs = np.append(self.player_first_runs[1:], len(self.run_starts)) - 1
+
+        current = self.run_lengths[last_runs] * np.where(self.run_wins[last_runs] == 1, 1, -1)
+        summary = pd.DataFrame({
+            "current_streak": current,
+            "streak": np.char.add(np.where(current > 0, "W", "L"), np.abs(current).astype(str)),
+            "longest_win_streak": np.maximum.reduceat(win_lengths, self.player_first_runs),
+            "longest_loss_streak": np.maximum.reduceat(loss_lengths, self.player_first_runs),
+        }, index=pd.Index(self.players, name="player"))
+
+        form = np.full(len(self.players), "", dtype=object)
+        for games_ago in range(FORM_GAMES, 0, -1):
+            positions = self.player_stops - games_ago
+            played = positions >= self.player_starts
+            form = form + np.where(played, np.where(self.is_win[np.maximum(positions, 0)] == 1, " W", " L"), "")
+        summary["form"] = np.char.strip(form.astype(str))
+        return summary
+
+    def get_rolling_win_pct(self, window=ROLLING_WINDOW):
+        """Win % over each player's last `window` games (fewer at the start of their history), after every game."""
+        games_played = self.player_stops - self.player_starts
+        return pd.DataFrame({
+            "match": self.matches,
+            "date": self.dates,
+            "player": pd.Categorical.from_codes(np.repeat(np.arange(len(self.players)), games_played), categories=self.players),
+            "is_win": self.is_win,
+            "rolling_win_pct": _rolling_win_pct(self.is_win, np.repeat(self.player_starts, games_played), window),
+        })
+
+    def get_player_rolling_win_pct(self, player, window=ROLLING_WINDOW):
+        position = self.player_positions.get(player)
+        if position is None:
+            return pd.DataFrame(columns=["match", "date", "is_win", "rolling_win_pct"])
+        start, stop = self.player_starts[position], self.player_stops[position]
+        return pd.DataFrame({
+            "match": self.matches[start:stop],
+            "date": self.dates[start:stop],
+            "is_win": self.is_win[start:stop],
+            "rolling_win_pct": _rolling_win_pct(self.is_win[start:stop], 0, window),
+        })
+
+
+@profiling.profiled()
+@utils.cache_by_data_version()
+def get_streaks(df: pd.DataFrame) -> Streaks:
+    return Streaks(df)
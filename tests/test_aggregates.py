@@ -0,0 +1,68 @@
+import pandas as pd
+import aggregates
+from benchmarks import synthetic
+
+
+def assert_same_aggregates(store, expected, players):
+    pd.testing.assert_frame_equal(store.get_date_df(), expected.get_date_df())
+    pd.testing.assert_frame_equal(store.get_venue_stats_df(), expected.get_venue_stats_df())
+    pd.testing.assert_frame_equal(store.get_venue_point_bins_df(), expected.get_venue_point_bins_df())
+    for player in players:
+        pd.testing.assert_frame_equal(store.get_player_win_loss_df(player), expected.get_player_win_loss_df(player))
+        pd.testing.assert_frame_equal(store.get_player_daily_df(player), expected.get_player_daily_df(player))
+        pd.testing.assert_frame_equal(store.get_player_daily_summary_df(player), expected.get_player_daily_summary_df(player))
+        pd.testing.assert_frame_equal(store.get_player_partner_df(player), expected.get_player_partner_df(player))
+
+
+def test_incremental_updates_match_full_rebuild():
+    df = synthetic.generate_match_table(20000, 8)
+    store = aggregates.AggregateStore()
+    for n_rows in [500, 501, 5000, 12000, 20000]:
+        store.update(df.iloc[:n_rows])
+
+    expected = aggregates.AggregateStore().update(df)
+    assert store.date.table["total_points_per_game_sum"].sum() == df["total_points_per_game"].astype(int).sum()
+    assert_same_aggregates(store, expected, ["player 1", "player 7"])
+
+
+def test_edit_to_seen_row_triggers_rebuild():
+    df = synthetic.generate_match_table(1000, 8)
+    store = aggregates.AggregateStore().update(df.iloc[:600])
+
+    edited = df.copy()
+    edited.loc[10, "total_points_per_game"] += 5
+    store.update(edited)
+    assert_same_aggregates(store, aggregates.AggregateStore().update(edited), ["player 1"])
+
+
+def test_empty_store():
+    store = aggregates.AggregateStore()
+    assert store.get_date_df().empty
+    assert store.get_venue_stats_df().empty
+    assert store.get_venue_point_bins_df().empty
+    assert store.get_player_win_loss_df("player 1").empty
+    assert store.get_player_daily_df("player 1").empty
+    assert store.get_player_daily_summary_df("player 1").empty
+    assert store.get_player_partner_df("player 1").empty
+
+
+def test_player_rows_match_the_sorted_table():
+    df = synthetic.generate_match_table(3000, 8)
+    store = aggregates.AggregateStore()
+    for n_rows in [1000, 2000, 3000]:
+        store.update(df.iloc[:n_rows])
+    assert store.player_daily.table.index.is_monotonic_increasing
+    for player in ["player 1", "player 7"]:
+        pd.testing.assert_frame_equal(store.player_daily.get_rows(player), store.player_daily.table.xs(player, level="player"))
+        pd.testing.assert_frame_equal(store.player_partner.get_rows(player), store.player_partner.table.xs(player, level="player"))
+
+
+def test_rebuild_keeps_the_lock():
+    df = synthetic.generate_match_table(1000, 8)
+    store = aggregates.AggregateStore().update(df.iloc[:600])
+    lock = store.lock
+    edited = df.copy()
+    edited.loc[10, "total_points_per_game"] += 5
+    with store.lock:
+        store.update(edited)
+    assert store.lock is lock and store.n_rows == 1000
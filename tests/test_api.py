@@ -0,0 +1,60 @@
+import json
+import pytest
+import api
+import player_index
+import streaks
+import utils
+from benchmarks import synthetic
+from sections import individual_stats
+from fetch_sheets_data import DATA_SOURCES
+
+
+@pytest.fixture(scope="module")
+def df():
+    return synthetic.generate_match_table(500, 8)
+
+
+@pytest.fixture(scope="module")
+def snapshot(df):
+    return api.StatsSnapshot(df)
+
+
+def test_player_resources_are_built_with_the_snapshot(df, snapshot):
+    for player in player_index.get_player_index(df).players:
+        assert snapshot.get_player_resource(player) is snapshot.player_resources[player]
+    assert snapshot.get_player_resource("nobody") is None
+    assert snapshot.get_player_resource("nobody", matches=True) is None
+    assert "nobody" not in snapshot.matches
+
+
+def test_player_matches_are_built_once_on_request(df):
+    snapshot = api.StatsSnapshot(df)
+    assert snapshot.matches == {}
+    matches = snapshot.get_player_resource("player 3", matches=True)
+    assert snapshot.get_player_resource("player 3", matches=True) is matches
+    assert list(snapshot.matches) == ["player 3"]
+
+
+def test_player_body_matches_its_frames(df, snapshot):
+    player = json.loads(snapshot.get_player_resource("player 3").body)
+    assert player["player"] == "player 3"
+    assert player["streaks"] == json.loads(streaks.get_streaks(df).get_summary().loc["player 3"].to_json())
+    assert player["daily"] == utils.get_json_records(individual_stats.get_player_daily_summary_df(df, "player 3"))
+    assert player["partners"] == utils.get_json_records(individual_stats.get_player_partner_df(df, "player 3").reset_index())
+
+
+def test_player_matches_match_player_stats(df, snapshot):
+    matches = json.loads(snapshot.get_player_resource("player 3", matches=True).body)
+    player_stats = utils.get_player_stats("player 3", df)
+    assert len(matches) == len(player_stats)
+    assert [match["is_win"] for match in matches] == player_stats["is_win"].tolist()
+
+
+def test_reload_keeps_the_snapshot_of_unchanged_data(tmp_path):
+    data_source = DATA_SOURCES["csv"](str(tmp_path))
+    data_source.write_sheet_data(utils.WORKBOOK_NAME, utils.WORKSHEET_NAME, synthetic.generate_records(200, 6))
+    service = api.StatsService(data_source)
+    service.load()
+    snapshot = service.snapshot
+    service.load()
+    assert service.snapshot is snapshot
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+import data_cache
+import utils
+from benchmarks import synthetic
+from fake_gspread import FakeClient
+from fetch_sheets_data import DATA_SOURCES, DataSource, Gsheet
+
+WORKBOOK = utils.WORKBOOK_NAME
+WORKSHEET = utils.WORKSHEET_NAME
+
+
+@pytest.fixture
+def records():
+    return synthetic.generate_records(300, 8, seed=1)
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource()
+
+
+@pytest.mark.parametrize("source", sorted(DATA_SOURCES))
+def test_local_source_round_trip(source, records, tmp_path):
+    data_source = DATA_SOURCES[source](str(tmp_path))
+    data_source.write_sheet_data(WORKBOOK, WORKSHEET, records)
+
+    pd.testing.assert_frame_equal(data_source.get_sheet_data(WORKBOOK, WORKSHEET), records, check_dtype=False)
+    pd.testing.assert_frame_equal(data_source.get_sheet_rows(WORKBOOK, WORKSHEET, start_row=102), records.iloc[100:].reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(utils.prepare_match_table(data_source.get_sheet_data(WORKBOOK, WORKSHEET)), utils.prepare_match_table(records))
+
+
+def test_gsheet_round_trip(records):
+    gsheet = Gsheet(client=FakeClient.from_records({WORKBOOK: {WORKSHEET: records}}))
+
+    pd.testing.assert_frame_equal(gsheet.get_sheet_data(WORKBOOK, WORKSHEET), records, check_dtype=False)
+    pd.testing.assert_frame_equal(gsheet.get_sheet_rows(WORKBOOK, WORKSHEET, start_row=102), records.iloc[100:].reset_index(drop=True), check_dtype=False)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_cache, "SNAPSHOT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_sync_snapshot_fetches_only_appended_rows(records, snapshot_dir, monkeypatch):
+    client = FakeClient.from_records({WORKBOOK: {WORKSHEET: records.iloc[:200]}})
+    gsheet = Gsheet(client=client)
+    worksheet = client.open(WORKBOOK).worksheet(WORKSHEET)
+
+    pd.testing.assert_frame_equal(data_cache.sync_snapshot(gsheet, WORKBOOK, WORKSHEET), records.iloc[:200], check_dtype=False)
+
+    worksheet.append_rows(records.iloc[200:].astype(str).values.tolist())
+    monkeypatch.setattr(worksheet, "get_all_values", lambda **kwargs: pytest.fail("incremental sync read the whole sheet"))
+    pd.testing.assert_frame_equal(data_cache.sync_snapshot(gsheet, WORKBOOK, WORKSHEET), records, check_dtype=False)
+    pd.testing.assert_frame_equal(data_cache.read_snapshot(data_cache.snapshot_path(WORKBOOK, WORKSHEET)), records, check_dtype=False)
+
+
+def test_sync_snapshot_picks_up_edits_after_refresh(records, snapshot_dir):
+    client = FakeClient.from_records({WORKBOOK: {WORKSHEET: records}})
+    gsheet = Gsheet(client=client)
+    data_cache.sync_snapshot(gsheet, WORKBOOK, WORKSHEET)
+
+    client.open(WORKBOOK).worksheet(WORKSHEET)._values[1][records.columns.get_loc("Team 1 Points")] = "99"
+    assert data_cache.sync_snapshot(gsheet, WORKBOOK, WORKSHEET)["Team 1 Points"].iloc[0] != 99
+
+    data_cache.clear_snapshots()
+    assert data_cache.sync_snapshot(gsheet, WORKBOOK, WORKSHEET)["Team 1 Points"].iloc[0] == 99
+
+
+def test_load_records_lines_up_tabs_with_differing_headers(records, tmp_path):
+    data_source = DATA_SOURCES["csv"](str(tmp_path))
+    data_source.write_sheet_data(WORKBOOK, "season 1", records.iloc[:150])
+    renamed = records.iloc[150:].rename(columns=lambda column: column if column in ("Timestamp", "result") else f"{column} (new form)")
+    data_source.write_sheet_data(WORKBOOK, "season 2", renamed)
+
+    combined = utils.load_records(data_source, [(WORKBOOK, "season 1"), (WORKBOOK, "season 2")])
+    assert list(combined.columns) == utils.RECORD_COLUMNS
+    pd.testing.assert_frame_equal(utils.prepare_match_table(combined), utils.prepare_match_table(records))
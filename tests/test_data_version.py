@@ -0,0 +1,24 @@
+import utils
+from benchmarks import synthetic
+
+
+def test_slices_and_copies_do_not_inherit_the_version():
+    base = synthetic.generate_match_table(500, 8)
+    base_version = utils.get_data_version(base)
+    head = base.iloc[:100]
+    assert utils.get_data_version(head) != base_version
+    assert utils.get_data_version(base.copy()) == base_version
+    assert utils.get_data_version(base.iloc[::-1].reset_index(drop=True)) != base_version
+
+
+def test_reused_ids_do_not_inherit_a_collected_frames_version():
+    base = synthetic.generate_match_table(500, 8)
+    expected = utils.get_data_version(base.iloc[:100].copy())
+    for _ in range(200):
+        a = base.iloc[:300].copy()
+        utils.stamp_data_version(a, "stale", window="stale")
+        b = a.copy()
+        del a
+        c = b.iloc[:100]
+        assert utils.get_window_key(c) == "all"
+        assert utils.get_data_version(c) == expected
@@ -0,0 +1,76 @@
+import datetime
+import pandas as pd
+import pytest
+import utils
+from benchmarks import synthetic
+from sections import datewise_stats
+
+
+@pytest.fixture(scope="module")
+def df():
+    return synthetic.generate_match_table(3000, 8)
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    ("2015-03-01", None),
+    (None, "2015-03-01"),
+    ("2015-02-10", "2015-02-20"),
+    (datetime.date(2015, 2, 10), datetime.date(2015, 2, 20)),
+    (pd.Timestamp("2015-02-10 12:00"), None),
+    ("2016-01-01", "2016-12-31"),
+])
+def test_window_matches_boolean_mask(df, start, end):
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df["date"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df["date"] <= pd.Timestamp(end)
+
+    window = utils.get_date_window(df, start, end)
+    pd.testing.assert_frame_equal(window, df[mask])
+
+
+def test_window_has_its_own_key_and_version(df):
+    window = utils.get_date_window(df, "2015-02-10", "2015-02-20", key="february")
+    assert utils.get_window_key(window) == "february"
+    assert utils.get_window_key(df) == "all"
+    assert utils.get_data_version(window) == f"{utils.get_data_version(df)}:february"
+
+    default_key = utils.get_date_window(df, datetime.date(2015, 2, 10), None)
+    assert utils.get_window_key(default_key) == "2015-02-10:None"
+    assert utils.get_window_key(window.iloc[:10]) == "all"
+    assert utils.get_data_version(window.iloc[:10]) != utils.get_data_version(window)
+
+
+def test_windowed_date_table_matches_filtered_table(df):
+    window = utils.get_date_window(df, "2015-02-10", "2015-03-20", key="test")
+    filtered = df[(df["date"] >= "2015-02-10") & (df["date"] <= "2015-03-20")].copy()
+    pd.testing.assert_frame_equal(datewise_stats.get_date_df(window), datewise_stats.get_date_df(filtered))
+
+
+class Sidebar:
+    def __init__(self, **values):
+        self.values = values
+
+    def selectbox(self, label, options, key):
+        assert self.values[key] in options
+        return self.values[key]
+
+    def date_input(self, label, value, key):
+        return self.values.get(key, value)
+
+
+@pytest.mark.parametrize("sidebar, start, end, window_key", [
+    (Sidebar(time_window="All time"), None, None, "all"),
+    (Sidebar(time_window="Last 7 days"), None, None, "last_7"),
+    (Sidebar(time_window="Season", time_window_season=2015), "2015-01-01", "2015-12-31", "season_2015"),
+    (Sidebar(time_window="Custom range", time_window_range=(datetime.date(2015, 3, 1), datetime.date(2015, 3, 31))), "2015-03-01", "2015-03-31", "2015-03-01:2015-03-31"),
+])
+def test_select_time_window(df, sidebar, start, end, window_key):
+    if window_key == "last_7":
+        # Recent windows end at the last game, not today
+        start = df["date"].iloc[-1] - pd.Timedelta(days=6)
+    window = utils.select_time_window(sidebar, df)
+    pd.testing.assert_frame_equal(window, utils.get_date_window(df, start, end))
+    assert utils.get_window_key(window) == window_key
@@ -0,0 +1,21 @@
+import numpy as np
+import utils
+from benchmarks import synthetic
+from sections import leaderboard
+
+
+def test_player_appearances_keep_wide_win_counters():
+    df = synthetic.generate_match_table(200, 10)
+    assert utils.get_player_appearances(df)["is_win"].dtype == np.int64
+
+
+def test_leaderboard_matches_per_player_stats():
+    df = synthetic.generate_match_table(2000, 8)
+    leaderboard_df = leaderboard.get_leaderboard_df(df).set_index("player")
+
+    assert leaderboard_df["wins_pct"].between(0, 100).all()
+    for player in leaderboard_df.index:
+        player_stats = utils.get_player_stats(player, df)
+        assert leaderboard_df.loc[player, "total_games"] == len(player_stats)
+        assert leaderboard_df.loc[player, "wins"] == (player_stats["result"] == "win").sum()
+        assert leaderboard_df.loc[player, "wins_pct"] == round((player_stats["result"] == "win").sum() * 100 / len(player_stats), 2)
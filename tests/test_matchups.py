@@ -0,0 +1,76 @@
+import numpy as np
+import matchups
+from benchmarks import synthetic
+
+TEAMS = {"team_1": ["team_1_player_1", "team_1_player_2"], "team_2": ["team_2_player_1", "team_2_player_2"]}
+
+
+def player_games(df, player):
+    """(team, opponent team) of each of `player`'s games, by filtering the match table row by row."""
+    for row in df.itertuples(index=False):
+        row = row._asdict()
+        for team, other in [("team_1", "team_2"), ("team_2", "team_1")]:
+            if player in [row[slot] for slot in TEAMS[team]]:
+                yield row, team, other
+
+
+def brute_force_records(df, player):
+    partners, opponents = {}, {}
+    for row, team, other in player_games(df, player):
+        won, points = row["winner"] == team, row[f"points_{team}"]
+        partner = next(row[slot] for slot in TEAMS[team] if row[slot] != player)
+        for records, rival in [(partners, partner)] + [(opponents, row[slot]) for slot in TEAMS[other]]:
+            games, wins, total_points = records.get(rival, (0, 0, 0))
+            records[rival] = (games + 1, wins + won, total_points + points)
+    return partners, opponents
+
+
+def assert_table_matches(table, records):
+    assert sorted(table.index) == sorted(records)
+    for rival, (games, wins, points) in records.items():
+        assert table.loc[rival, "total_games"] == games
+        assert table.loc[rival, "wins"] == wins
+        assert table.loc[rival, "average_ppg"] == round(points / games, 2)
+        assert table.loc[rival, "win_pct"] == round(wins * 100 / games, 2)
+
+
+def test_partner_and_opponent_tables_match_brute_force():
+    df = synthetic.generate_match_table(1500, 8)
+    matrices = matchups.MatchupMatrices(df)
+    for player in ["player 0", "player 4", "player 7"]:
+        partners, opponents = brute_force_records(df, player)
+        assert_table_matches(matrices.get_partner_table(player), partners)
+        assert_table_matches(matrices.get_opponent_table(player), opponents)
+
+
+def test_rivalry_matches_brute_force():
+    df = synthetic.generate_match_table(1500, 8)
+    rivalry = matchups.MatchupMatrices(df).get_rivalry("player 2", "player 3")
+
+    against = [(row, team, other) for row, team, other in player_games(df, "player 2") if "player 3" in [row[slot] for slot in TEAMS[other]]]
+    together = [(row, team) for row, team, _ in player_games(df, "player 2") if "player 3" in [row[slot] for slot in TEAMS[team]]]
+    wins = sum(row["winner"] == team for row, team, _ in against)
+    assert rivalry == dict(
+        games_against=len(against),
+        wins=wins,
+        losses=len(against) - wins,
+        points_for=sum(row[f"points_{team}"] for row, team, _ in against),
+        points_against=sum(row[f"points_{other}"] for row, _, other in against),
+        games_together=len(together),
+        wins_together=sum(row["winner"] == team for row, team in together),
+    )
+
+
+def test_best_partnerships_are_sorted_and_symmetric():
+    df = synthetic.generate_match_table(1500, 8)
+    matrices = matchups.MatchupMatrices(df)
+    best = matrices.get_best_partnerships(min_games=5, top=10)
+    assert (best["total_games"] >= 5).all()
+    assert list(best["win_pct"]) == sorted(best["win_pct"], reverse=True)
+    np.testing.assert_array_equal(matrices.partner_games, matrices.partner_games.T)
+
+
+def test_unknown_player():
+    matrices = matchups.MatchupMatrices(synthetic.generate_match_table(100, 8))
+    assert matrices.get_partner_table("nobody").empty
+    assert matrices.get_rivalry("nobody", "player 1")["games_against"] == 0
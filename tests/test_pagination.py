@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import utils
+
+
+def make_table(n_rows=40):
+    dates = pd.date_range("2022-01-01", periods=n_rows // 2).repeat(2)
+    return pd.DataFrame({
+        "total_games": np.arange(n_rows) % 7,
+        "wins": np.arange(n_rows) % 3,
+        "label": [f"row {i}" for i in range(n_rows)],
+    }, index=pd.Index(dates, name="date"))
+
+
+def test_page_count():
+    assert utils.get_page_count(0, 15) == 1
+    assert utils.get_page_count(15, 15) == 1
+    assert utils.get_page_count(16, 15) == 2
+
+
+def test_page_bounds_are_clamped():
+    df = make_table(40)
+    first, n_pages = utils.get_table_page(df, page=0, page_size=15)
+    assert n_pages == 3
+    pd.testing.assert_frame_equal(first, df.iloc[:15])
+    last, _ = utils.get_table_page(df, page=99, page_size=15)
+    pd.testing.assert_frame_equal(last, df.iloc[30:])
+    empty, n_pages = utils.get_table_page(df.iloc[:0], page=3, page_size=15)
+    assert empty.empty and n_pages == 1
+
+
+def test_sort_is_stable_and_accepts_the_index_name():
+    df = make_table(40).iloc[::-1]
+    page, _ = utils.get_table_page(df, page=1, page_size=40, sort_by="date")
+    assert page.index.is_monotonic_increasing
+    for _, rows in page.groupby(level="date"):
+        assert rows["label"].tolist() == df.loc[rows.index[0], "label"].tolist()
+
+    page, _ = utils.get_table_page(df, page=2, page_size=15, sort_by="total_games", ascending=False)
+    expected = df.sort_values("total_games", ascending=False, kind="stable").iloc[15:30]
+    pd.testing.assert_frame_equal(page, expected)
+
+
+def test_columns_are_projected_after_sorting():
+    page, _ = utils.get_table_page(make_table(40), page=1, page_size=10, sort_by="wins", columns=["label"])
+    assert list(page.columns) == ["label"]
+    assert page["label"].tolist() == make_table(40).sort_values("wins", kind="stable")["label"].iloc[:10].tolist()
+
+
+class Controls:
+    def __init__(self, sort_by="-", order="Ascending", page=1):
+        self.values = {"Sort by": sort_by, "Order": order}
+        self.page = page
+
+    def selectbox(self, label, options, **kwargs):
+        assert self.values[label] in options
+        return self.values[label]
+
+    radio = selectbox
+
+    def number_input(self, label, min_value, max_value, value, **kwargs):
+        return self.page
+
+
+class TableContainer:
+    def plotly_chart(self, figure):
+        self.figure = figure
+
+    def caption(self, text):
+        self.caption_text = text
+
+
+def test_highlight_lines_up_with_rows_on_later_pages():
+    df = make_table(40).reset_index()
+    highlight = df["wins"] == 2
+    shown = []
+
+    def create_figure(page_df):
+        shown.append(page_df)
+        return utils.create_go_table_figure(page_df)
+
+    table = TableContainer()
+    utils.display_paginated_table(table, Controls(sort_by="total_games", page=2), df, key="test", create_figure=create_figure, highlight=highlight, page_size=15)
+
+    page_df = shown[0]
+    expected = df.sort_values("total_games", kind="stable").iloc[15:30]
+    pd.testing.assert_frame_equal(page_df, expected)
+    fill = table.figure.data[0].cells.fill.color[0]
+    assert list(fill) == ["#b5de2b" if wins == 2 else "#eceff1" for wins in page_df["wins"]]
+    assert table.caption_text == "Rows 16 - 30 of 40"
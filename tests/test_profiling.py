@@ -0,0 +1,52 @@
+import threading
+import tracemalloc
+import pytest
+import profiling
+
+
+class Container:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(name)
+
+
+def profiled_run(container, error=None):
+    with profiling.profile_run(container, True, name="test"):
+        with profiling.span("work"):
+            assert tracemalloc.is_tracing()
+        if error:
+            raise error
+
+
+def test_run_is_shown_and_ended():
+    container = Container()
+    profiled_run(container)
+    assert "dataframe" in container.calls
+    assert not profiling.is_enabled()
+    assert profiling._tracing_runs == 0 and not tracemalloc.is_tracing()
+
+
+def test_run_is_ended_when_script_stops_early():
+    with pytest.raises(RuntimeError):
+        profiled_run(Container(), RuntimeError("st.stop()"))
+    assert profiling._tracing_runs == 0 and not tracemalloc.is_tracing()
+
+
+def test_run_is_ended_in_script_threads():
+    errors = []
+
+    def run():
+        try:
+            profiled_run(Container(), RuntimeError("rerun"))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4
+    assert profiling._tracing_runs == 0 and not tracemalloc.is_tracing()
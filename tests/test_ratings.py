@@ -0,0 +1,40 @@
+import pandas as pd
+import ratings
+from benchmarks import synthetic
+
+
+def assert_same_ratings(engine, expected):
+    pd.testing.assert_series_equal(engine.get_ratings().sort_index(), expected.get_ratings().sort_index())
+    for player in expected.players:
+        pd.testing.assert_frame_equal(
+            engine.get_player_history(player).reset_index(drop=True),
+            expected.get_player_history(player).reset_index(drop=True),
+            check_categorical=False,
+        )
+
+
+def test_incremental_updates_match_full_rebuild():
+    df = synthetic.generate_match_table(5000, 8)
+    engine = ratings.RatingEngine()
+    for n_rows in [300, 301, 2000, 5000]:
+        engine.update(df.iloc[:n_rows])
+    assert_same_ratings(engine, ratings.RatingEngine().update(df))
+
+
+def test_edit_to_seen_row_triggers_rebuild():
+    df = synthetic.generate_match_table(1000, 8)
+    engine = ratings.RatingEngine().update(df.iloc[:600])
+
+    edited = df.copy()
+    edited.loc[10, ["points_team_1", "points_team_2"]] = edited.loc[10, ["points_team_2", "points_team_1"]].to_numpy()
+    engine.update(edited)
+    assert_same_ratings(engine, ratings.RatingEngine().update(edited))
+
+
+def test_replay_keeps_the_lock():
+    df = synthetic.generate_match_table(1000, 8)
+    engine = ratings.RatingEngine().update(df.iloc[:600])
+    lock = engine.lock
+    with engine.lock:
+        engine.update(df.iloc[::-1].reset_index(drop=True))
+    assert engine.lock is lock and engine.n_rows == 1000
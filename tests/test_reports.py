@@ -0,0 +1,35 @@
+import os
+import pytest
+import reports
+import utils
+from benchmarks import synthetic
+
+
+@pytest.fixture
+def records():
+    return synthetic.generate_records(400, 6, seed=2)
+
+
+def test_unchanged_players_are_skipped(records, tmp_path):
+    df = utils.prepare_match_table(records)
+    players = reports.select_players(df)
+    assert sorted(reports.write_reports(df, tmp_path, workers=2)) == sorted(players)
+    assert reports.write_reports(utils.prepare_match_table(records), tmp_path, workers=2) == []
+
+    # The last match is also the last one rated, so only its four players' reports change
+    edited = records.copy()
+    last = edited.index[-1]
+    loser = "Team 2 Points" if edited.loc[last, "Team 1 Points"] > edited.loc[last, "Team 2 Points"] else "Team 1 Points"
+    edited.loc[last, loser] = 0 if edited.loc[last, loser] != 0 else 1
+    edited_df = utils.prepare_match_table(edited)
+    last_match_players = {edited_df[column].iloc[-1] for column in utils.PLAYER_COLUMNS}
+    assert set(reports.write_reports(edited_df, tmp_path, workers=2)) == last_match_players
+    assert reports.read_manifest(tmp_path)["league"] == utils.get_data_version(edited_df)
+
+
+def test_player_names_are_normalized_and_checked(records, tmp_path):
+    df = utils.prepare_match_table(records)
+    assert reports.write_reports(df, tmp_path, players=[" Player 1", "player 1"], workers=1) == ["player 1"]
+    assert os.path.exists(tmp_path / "players" / "player_1.html")
+    with pytest.raises(ValueError, match="nobody"):
+        reports.write_reports(df, tmp_path, players=["Player 1", "Nobody"], workers=1)
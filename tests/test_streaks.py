@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import streaks
+from benchmarks import synthetic
+
+SLOTS = {"team_1": ["team_1_player_1", "team_1_player_2"], "team_2": ["team_2_player_1", "team_2_player_2"]}
+
+
+def player_results(df, player):
+    """The player's results (1 for a win) by date, then sheet order, with their match positions."""
+    results = []
+    for position, row in enumerate(df.itertuples(index=False)):
+        row = row._asdict()
+        for team in SLOTS:
+            if player in [row[slot] for slot in SLOTS[team]]:
+                results.append((row["date"], position, int(row["winner"] == team)))
+    results.sort(key=lambda result: result[:2])
+    return [position for _, position, _ in results], [won for _, _, won in results]
+
+
+def brute_force_runs(results):
+    runs = []
+    for won in results:
+        if runs and runs[-1][0] == won:
+            runs[-1][1] += 1
+        else:
+            runs.append([won, 1])
+    return runs
+
+
+def test_summary_matches_brute_force():
+    df = synthetic.generate_match_table(3000, 8)
+    summary = streaks.Streaks(df).get_summary()
+    for player in summary.index:
+        _, results = player_results(df, player)
+        runs = brute_force_runs(results)
+        won, length = runs[-1]
+        assert summary.loc[player, "current_streak"] == (length if won else -length)
+        assert summary.loc[player, "streak"] == f"{'W' if won else 'L'}{length}"
+        assert summary.loc[player, "longest_win_streak"] == max([length for won, length in runs if won], default=0)
+        assert summary.loc[player, "longest_loss_streak"] == max([length for won, length in runs if not won], default=0)
+        assert summary.loc[player, "form"] == " ".join("W" if won else "L" for won in results[-streaks.FORM_GAMES:])
+
+
+def test_rolling_win_pct_matches_brute_force():
+    df = synthetic.generate_match_table(3000, 8)
+    player_streaks = streaks.Streaks(df)
+    for player in ["player 1", "player 5"]:
+        positions, results = player_results(df, player)
+        for window in [1, streaks.ROLLING_WINDOW, 50]:
+            expected = [round(np.mean(results[max(0, i + 1 - window):i + 1]) * 100, 2) for i in range(len(results))]
+            rolling = player_streaks.get_player_rolling_win_pct(player, window)
+            assert rolling["match"].tolist() == positions
+            assert rolling["is_win"].tolist() == results
+            np.testing.assert_allclose(rolling["rolling_win_pct"], expected)
+
+
+def test_rolling_win_pct_of_all_players_matches_per_player():
+    df = synthetic.generate_match_table(1000, 8)
+    player_streaks = streaks.Streaks(df)
+    rolling = player_streaks.get_rolling_win_pct()
+    for player in player_streaks.players:
+        pd.testing.assert_frame_equal(
+            rolling[rolling["player"] == player].drop(columns="player").reset_index(drop=True),
+            player_streaks.get_player_rolling_win_pct(player),
+        )
+
+
+def test_unknown_player():
+    assert streaks.Streaks(synthetic.generate_match_table(100, 8)).get_player_rolling_win_pct("nobody").empty
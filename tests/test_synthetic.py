@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+import utils
+from benchmarks import synthetic
+
+
+def test_too_few_players_is_rejected():
+    with pytest.raises(ValueError):
+        synthetic.generate_records(10, 3)
+
+
+def test_every_match_has_four_distinct_players():
+    df = synthetic.generate_match_table(500, 4)
+    player_codes, _ = utils.get_player_codes(df)
+    assert (np.diff(np.sort(player_codes, axis=1), axis=1) != 0).all()
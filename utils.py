@@ -1,17 +1,36 @@
 import streamlit as st
+import functools
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import plotly.express as px
 import pandas as pd
 import numpy as np
 import os
-from fetch_sheets_data import Gsheet
+from fetch_sheets_data import Gsheet, DATA_SOURCES
 import json
 import plotly.graph_objects as go
+import data_cache
+import profiling
+
+WORKBOOK_NAME = "Badminton_Records"
+WORKSHEET_NAME = "Form responses 1"
+DATE_FORMAT = os.environ.get("DATE_FORMAT")
+DISPLAY_DATE_FORMAT = "%Y-%m-%d"
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", 8))
+TABLE_PAGE_SIZE = 15
+WINDOW_CACHE_SIZE = 8
+RECENT_WINDOWS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
+PLAYER_COLUMNS = ["team_1_player_1", "team_1_player_2", "team_2_player_1", "team_2_player_2"]
+RECORD_COLUMNS = ["date", *PLAYER_COLUMNS, "points_team_1", "points_team_2", "venue"]
 
 
 def get_player_stats(player, df: pd.DataFrame):
     player_matches = df[
         np.where(
-            np.logical_or.reduce([df[i] == player for i in ["team_1_player_1", "team_1_player_2", "team_2_player_1", "team_2_player_2"]]),
+            np.logical_or.reduce([df[i] == player for i in PLAYER_COLUMNS]),
             True,
             False
         )
@@ -36,24 +55,119 @@ def get_player_stats(player, df: pd.DataFrame):
     
     return player_matches
 
+def get_player_codes(df: pd.DataFrame):
+    """Returns the four player columns as an (n, 4) array of codes into a shared player categorical dtype."""
+    if all(isinstance(df[i].dtype, pd.CategoricalDtype) and df[i].dtype == df[PLAYER_COLUMNS[0]].dtype for i in PLAYER_COLUMNS):
+        return np.column_stack([df[i].cat.codes.to_numpy() for i in PLAYER_COLUMNS]), df[PLAYER_COLUMNS[0]].dtype
+
+    codes, players = pd.factorize(df[PLAYER_COLUMNS].to_numpy().ravel(), sort=True)
+    return codes.reshape(-1, 4), pd.CategoricalDtype(players)
+
+def get_player_appearances(df: pd.DataFrame):
+    """
+    Reshapes the match table into one row per player per match, in match order.
+    `match` is the row position of the match in `df`.
+    """
+    player_codes, player_dtype = get_player_codes(df)
+    side_codes = np.tile([0, 0, 1, 1], df.shape[0])
+    team_points = df[["points_team_1", "points_team_1", "points_team_2", "points_team_2"]].to_numpy()
+
+    appearances = pd.DataFrame({
+        "match": np.repeat(np.arange(df.shape[0]), 4),
+        "player": pd.Categorical.from_codes(player_codes.ravel(), dtype=player_dtype),
+        "belongs_to": pd.Categorical.from_codes(side_codes, categories=["team_1", "team_2"]),
+        "player_team_points": team_points.ravel(),
+        "partner": pd.Categorical.from_codes(player_codes[:, [1, 0, 3, 2]].ravel(), dtype=player_dtype),
+        "opponent_1": pd.Categorical.from_codes(player_codes[:, [2, 2, 0, 0]].ravel(), dtype=player_dtype),
+        "opponent_2": pd.Categorical.from_codes(player_codes[:, [3, 3, 1, 1]].ravel(), dtype=player_dtype),
+    })
+    winner_codes = np.repeat(np.where(df["winner"].to_numpy() == "team_1", 0, 1), 4)
+    appearances["is_win"] = np.where(side_codes == winner_codes, 1, 0)
+
+    return appearances
+
+@functools.lru_cache(maxsize=None)
 def get_gsheet():
-    if os.environ["STREAMLIT_APP_MODE"] == "test":
+    if os.environ.get("STREAMLIT_APP_MODE") == "test":
         with open(os.environ['CONFIG_FILE_PATH']) as f:
             return Gsheet(json.load(f))
     else:
         return Gsheet(st.secrets['gsheet_configs'])
 
+def get_data_source():
+    """
+    DATA_SOURCE picks the backend: "gsheet" (default), or one of the local
+    "csv", "parquet" and "sqlite" backends reading from DATA_SOURCE_PATH.
+    """
+    source = os.environ.get("DATA_SOURCE", "gsheet")
+    if source == "gsheet":
+        return get_gsheet()
+    return DATA_SOURCES[source](os.environ["DATA_SOURCE_PATH"])
+
+def get_worksheets():
+    """
+    WORKSHEETS lists the tabs to combine (e.g. one per season or club) as "workbook/worksheet"
+    entries separated by ";", oldest first; a bare worksheet name is looked up in WORKBOOK_NAME.
+    Defaults to the single form responses tab.
+    """
+    worksheets = [entry.strip() for entry in os.environ.get("WORKSHEETS", "").split(";") if entry.strip()]
+    if not worksheets:
+        return [(WORKBOOK_NAME, WORKSHEET_NAME)]
+    return [tuple(entry.split("/", 1)) if "/" in entry else (WORKBOOK_NAME, entry) for entry in worksheets]
+
+def normalize_records(records: pd.DataFrame):
+    """Drops the form's Timestamp and result columns and names the rest by position, so tabs with differing headers line up."""
+    records = records.drop(["Timestamp", "result"], axis=1, errors="ignore")
+    records.columns = RECORD_COLUMNS
+    return records
+
+def load_worksheet_records(data_source, workbook_name, worksheet_name):
+    if data_source.is_remote:
+        return normalize_records(data_cache.sync_snapshot(data_source, workbook_name, worksheet_name))
+    return normalize_records(data_source.get_sheet_data(workbook_name, worksheet_name))
+
+@profiling.profiled("data.fetch")
+def load_records(data_source, worksheets=None):
+    """Fetches the worksheets concurrently and stacks their normalized records in the order listed."""
+    worksheets = worksheets or get_worksheets()
+    if len(worksheets) == 1:
+        return load_worksheet_records(data_source, *worksheets[0])
+
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(worksheets))) as pool:
+        records = list(pool.map(lambda worksheet: load_worksheet_records(data_source, *worksheet), worksheets))
+    return pd.concat(records, ignore_index=True)
+
+@st.experimental_memo(ttl=data_cache.CACHE_TTL, show_spinner=False)
+def _load_data():
+    df = prepare_match_table(load_records(get_data_source()))
+    return df, get_data_version(df)
+
+@profiling.profiled("data.get_data")
 def get_data():
-    gsheet = get_gsheet()
-    df = gsheet.get_sheet_data("Badminton_Records", "Form responses 1").drop(["Timestamp", "result"], axis=1)
+    # The memo hands back a fresh copy on every call; it holds exactly the rows that were hashed.
+    df, data_version = _load_data()
+    stamp_data_version(df, data_version)
+    return df
+
+@profiling.profiled("data.transform")
+def prepare_match_table(records: pd.DataFrame):
+    """Turns form responses (raw or already normalized) into the typed match table used by every section."""
+    df = normalize_records(records)
 
-    df.columns = ["date", "team_1_player_1", "team_1_player_2", "team_2_player_1", "team_2_player_2", "points_team_1", "points_team_2", "venue"]
+    player_codes, players = _normalized_codes(df[PLAYER_COLUMNS].to_numpy().ravel())
+    player_codes = player_codes.reshape(-1, 4)
+    for i, column in enumerate(PLAYER_COLUMNS):
+        df[column] = pd.Categorical.from_codes(player_codes[:, i], categories=players)
+    df["venue"] = pd.Categorical.from_codes(*_normalized_codes(df["venue"].to_numpy()))
 
-    df['winner'] = np.where(df.points_team_1 > df.points_team_2, 'team_1', 'team_2')
+    date_codes, dates = pd.factorize(df["date"], use_na_sentinel=False)
+    df["date"] = pd.to_datetime(pd.Series(dates).astype(str).str.strip(), format=DATE_FORMAT).to_numpy()[date_codes]
+
+    df[["points_team_1", "points_team_2"]] = df[["points_team_1", "points_team_2"]].astype("int16")
+    df['winner'] = pd.Categorical(np.where(df.points_team_1 > df.points_team_2, 'team_1', 'team_2'), categories=['team_1', 'team_2'])
     df['margin'] = abs(df.points_team_1 - df.points_team_2)
     df['total_points_per_game'] = df["points_team_1"] + df["points_team_2"]
 
-    df = df.applymap(lambda x: f'{x}'.lower().strip() if isinstance(x, str) else x)
     df['point_bins'] = pd.cut(
         df['total_points_per_game'],
         [0, 30, 35, 40, 45, float("inf")],
@@ -61,8 +175,166 @@ def get_data():
         labels=['< 30', '30 - 35', '35 - 40', '40 - 45', "> 45"]
     )
 
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable", ignore_index=True)
     return df
 
+def normalize_name(name):
+    """A player or venue name the way `prepare_match_table` stores it."""
+    return f"{name}".lower().strip()
+
+def _normalized_codes(values):
+    """Lower-cases and strips only the distinct values, returning codes into the sorted normalized categories."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    normalized = pd.Index(uniques.astype(str)).str.lower().str.strip()
+    categories, normalized_codes = np.unique(normalized.to_numpy(), return_inverse=True)
+    return normalized_codes[codes], categories
+
+_stamps = {}
+
+def stamp_data_version(df: pd.DataFrame, data_version, **attrs):
+    """
+    Records `data_version` (and any other `attrs`) for `df` itself. Stamps are kept outside the
+    frame, by id and checked through a weak reference: pandas copies attrs into every slice and
+    copy, and the id of a collected frame is reused, so neither may carry a stamp over.
+    """
+    key = id(df)
+    _stamps[key] = (weakref.ref(df, lambda _, key=key: _stamps.pop(key, None)), {**attrs, "data_version": data_version})
+
+def _get_stamp(df: pd.DataFrame):
+    ref, stamp = _stamps.get(id(df), (None, None))
+    return stamp if ref is not None and ref() is df else None
+
+def get_data_version(df: pd.DataFrame):
+    """Order-sensitive content hash of the match table, so derived structures can be memoized per version."""
+    stamp = _get_stamp(df)
+    if stamp is None:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        data_version = hashlib.sha1(row_hashes).hexdigest()
+        stamp_data_version(df, data_version)
+        _remember_row_hashes(data_version, row_hashes)
+        return data_version
+    return stamp["data_version"]
+
+_row_hashes = OrderedDict()
+_row_hashes_lock = threading.Lock()
+
+def _remember_row_hashes(data_version, row_hashes, maxsize=4):
+    with _row_hashes_lock:
+        _row_hashes[data_version] = row_hashes
+        _row_hashes.move_to_end(data_version)
+        while len(_row_hashes) > maxsize:
+            _row_hashes.popitem(last=False)
+
+def get_row_hashes(df: pd.DataFrame):
+    """Per-row content hashes of `df`, kept for the most recent data versions."""
+    data_version = get_data_version(df)
+    with _row_hashes_lock:
+        row_hashes = _row_hashes.get(data_version)
+    if row_hashes is None:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        _remember_row_hashes(data_version, row_hashes)
+    return row_hashes
+
+def get_rows_digest(df: pd.DataFrame, n_rows=None):
+    """sha1 of the content of the first `n_rows` rows of `df` (all of them by default), in order."""
+    return hashlib.sha1(get_row_hashes(df)[:n_rows]).hexdigest()
+
+def get_json_records(df: pd.DataFrame):
+    """`df` as a list of JSON-safe row dicts, dates in ISO format."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+def get_window_key(df: pd.DataFrame):
+    stamp = _get_stamp(df)
+    return stamp.get("window", "all") if stamp else "all"
+
+def get_date_window(df: pd.DataFrame, start=None, end=None, key=None):
+    """
+    Rows with `start <= date <= end` (either bound optional), found by binary search on the
+    date-sorted match table. The slice gets its own window key and data version.
+    """
+    dates = df["date"].to_numpy()
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left")
+    hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+
+    key = key or f"{start}:{end}"
+    window = df.iloc[lo:hi]
+    stamp_data_version(window, f"{get_data_version(df)}:{key}", window=key)
+    return window
+
+def select_time_window(container, df: pd.DataFrame):
+    """Sidebar time window picker; returns the matching slice of `df`."""
+    last_date = df["date"].iloc[-1] if not df.empty else pd.Timestamp.today().normalize()
+    seasons = sorted(df["date"].dt.year.unique().tolist(), reverse=True)
+    window = container.selectbox("Time window", ["All time", *RECENT_WINDOWS, "Season", "Custom range"], key="time_window")
+
+    if window in RECENT_WINDOWS:
+        days = RECENT_WINDOWS[window]
+        return get_date_window(df, start=last_date - pd.Timedelta(days=days - 1), key=f"last_{days}")
+    if window == "Season" and seasons:
+        season = container.selectbox("Season", seasons, key="time_window_season")
+        return get_date_window(df, start=f"{season}-01-01", end=f"{season}-12-31", key=f"season_{season}")
+    if window == "Custom range":
+        dates = container.date_input("Date range", value=(last_date - pd.Timedelta(days=29), last_date), key="time_window_range")
+        start, end = (dates[0], dates[-1]) if dates else (None, None)
+        return get_date_window(df, start=start, end=end)
+    return df
+
+class WindowedInstances:
+    """
+    One long-lived incremental object (aggregate store, rating engine) per time window, so
+    switching between the usual windows reuses their state instead of rebuilding it.
+    """
+
+    def __init__(self, factory, maxsize=WINDOW_CACHE_SIZE):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.instances = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, df: pd.DataFrame):
+        key = get_window_key(df)
+        with self.lock:
+            if key not in self.instances:
+                self.instances[key] = self.factory()
+            self.instances.move_to_end(key)
+            while len(self.instances) > self.maxsize:
+                self.instances.popitem(last=False)
+            return self.instances[key]
+
+def cache_by_data_version(maxsize=WINDOW_CACHE_SIZE):
+    """
+    Memoizes `fn(df, *args)` on the data version of `df`. Unlike the Streamlit caches it keeps
+    working outside a Streamlit session, e.g. in the benchmarks.
+    """
+    def decorator(fn):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(df, *args):
+            key = (get_data_version(df), *args)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+
+            value = fn(df, *args)
+            with lock:
+                cache[key] = value
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        wrapper.clear = cache.clear
+        return wrapper
+    return decorator
+
+def refresh_data():
+    """Drops the memoized table and the local snapshots, so the next load re-fetches every worksheet in full."""
+    _load_data.clear()
+    data_cache.clear_snapshots()
+
 def create_go_table_figure(df):
     go_table = go.Table(
         header=dict(
@@ -73,7 +345,7 @@ def create_go_table_figure(df):
             font=dict(color="white", size=16, family="Arial")
         ),
         cells=dict(
-            values=[df[i] for i in df.columns], 
+            values=[df[i].dt.strftime(DISPLAY_DATE_FORMAT) if pd.api.types.is_datetime64_any_dtype(df[i]) else df[i] for i in df.columns], 
             align="left", 
             height=30,
             fill_color='#eceff1'
@@ -81,4 +353,36 @@ def create_go_table_figure(df):
     )
     fig = go.Figure(go_table)
     fig.update_layout(margin=dict(t=0, b=0))
-    return fig
\ No newline at end of file
+    return fig
+
+def get_page_count(n_rows, page_size=TABLE_PAGE_SIZE):
+    return max(1, -(-n_rows // page_size))
+
+def get_table_page(df: pd.DataFrame, page=1, page_size=TABLE_PAGE_SIZE, sort_by=None, ascending=True, columns=None):
+    """Returns one page of `df` (after sorting / column projection) and the number of pages."""
+    if sort_by is not None:
+        df = df.sort_values(sort_by, ascending=ascending, kind="stable")
+    n_pages = get_page_count(df.shape[0], page_size)
+    page = min(max(page, 1), n_pages)
+    page_df = df.iloc[(page - 1) * page_size:page * page_size]
+    return (page_df if columns is None else page_df[columns]), n_pages
+
+def display_paginated_table(table_container, controls_container, df: pd.DataFrame, key, create_figure=create_go_table_figure, highlight=None, page_size=TABLE_PAGE_SIZE, columns=None):
+    """
+    Renders one page of `df` with `create_figure`, so only the visible rows are sent to the browser.
+    `create_figure` gets the page with `df`'s index intact; `highlight` is a boolean Series over
+    all of `df` marking the rows to fill green, so it holds across pages.
+    """
+    sort_options = ([df.index.name] if df.index.name else []) + list(df.columns)
+    sort_by = controls_container.selectbox("Sort by", ["-"] + sort_options, key=f"{key}_sort_by")
+    ascending = controls_container.radio("Order", ["Descending", "Ascending"], horizontal=True, key=f"{key}_order") == "Ascending"
+    n_pages = get_page_count(df.shape[0], page_size)
+    page = controls_container.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, key=f"{key}_page")
+
+    page = min(page, n_pages)
+    page_df, _ = get_table_page(df, page, page_size, sort_by=None if sort_by == "-" else sort_by, ascending=ascending, columns=columns)
+    table_fig = create_figure(page_df)
+    if highlight is not None:
+        table_fig.update_traces(cells_fill_color=[np.where(highlight.loc[page_df.index], '#b5de2b', '#eceff1')])
+    table_container.plotly_chart(table_fig)
+    table_container.caption(f"Rows {(page - 1) * page_size + min(1, page_df.shape[0])} - {(page - 1) * page_size + page_df.shape[0]} of {df.shape[0]}")